@@ -1102,6 +1102,142 @@ def ejecutar_pruebas_v14_1():
     return len(errores) == 0
 
 
+# ══════════════════════════════════════════════════════════════════════════════
+# BENCHMARKS v15.2
+# No se ejecutan al importar: llamar a mano con todas las celdas cargadas.
+# Cada uno compara la versión actual con una copia congelada de la anterior
+# sobre datos de semilla fija y verifica que den el mismo resultado.
+# ══════════════════════════════════════════════════════════════════════════════
+
+def _es_dato_de_sede_referencia(fila: list) -> bool:
+    """Implementación anterior de es_dato_de_sede (recorridos lineales), congelada para el benchmark."""
+    if not fila or len(fila) < 3:
+        return False
+
+    col0 = str(fila[0]).upper().strip() if fila[0] is not None else ''
+    col1 = str(fila[1]).upper().strip() if len(fila) > 1 and fila[1] is not None else ''
+
+    es_depto = col0 in DEPARTAMENTOS_COLOMBIA or any(d in col0 for d in DEPARTAMENTOS_COLOMBIA)
+    es_muni = col1 in MUNICIPIOS_COLOMBIA or any(m in col1 for m in MUNICIPIOS_COLOMBIA)
+
+    if es_depto and es_muni:
+        return True
+
+    for celda in fila[:8]:
+        if celda:
+            celda_str = str(celda).upper()
+            for patron in PATRONES_DIRECCION:
+                if patron in celda_str:
+                    for otra in fila[:8]:
+                        if otra:
+                            otra_str = str(otra).strip().replace('.0', '').replace('-', '')
+                            if otra_str.isdigit() and 8 <= len(otra_str) <= 12:
+                                return True
+
+    return False
+
+
+def benchmark_es_dato_de_sede(n_filas=20000, repeticiones=3, semilla=7):
+    """🆕 v15.2: es_dato_de_sede (gazetteers) contra la implementación anterior sobre
+    una hoja sintética de semilla fija (~15% filas de sede, ~5% con dirección)."""
+    import random
+    import time
+
+    rnd = random.Random(semilla)
+    deptos, munis = sorted(DEPARTAMENTOS_COLOMBIA), sorted(MUNICIPIOS_COLOMBIA)
+    filas = []
+    for _ in range(n_filas):
+        tipo = rnd.random()
+        if tipo < 0.15:
+            fila = [rnd.choice(deptos), rnd.choice(munis), f"{rnd.randint(10**9, 10**10 - 1)}", rnd.randint(1, 9),
+                    f"IPS SEDE {rnd.randint(1, 50)}", f"CALLE {rnd.randint(1, 150)} # {rnd.randint(1, 99)}-{rnd.randint(1, 99)}",
+                    f"{rnd.randint(3000000000, 3509999999)}", 'sede@ips.com']
+        elif tipo < 0.20:
+            fila = [None, None, f"CRA {rnd.randint(1, 99)} NO {rnd.randint(1, 99)}", None,
+                    f"{rnd.randint(10**8, 10**9 - 1)}.0", None, None, None]
+        else:
+            fila = [f"{rnd.randint(100000, 999999)}", f"PROCEDIMIENTO {rnd.randint(1, 9999)} DE CONSULTA",
+                    float(rnd.randint(5000, 900000)), 'SOAT', f"{rnd.choice([-20, -10, 0, 5])}%", None,
+                    'INCLUYE MATERIALES' if rnd.random() < 0.1 else None, None, None, None]
+        filas.append(fila)
+
+    esperados = [_es_dato_de_sede_referencia(f) for f in filas]
+    obtenidos = [es_dato_de_sede(f) for f in filas]
+    assert esperados == obtenidos, "es_dato_de_sede difiere de la implementación de referencia"
+
+    tiempos = {}
+    for nombre, fn in (('referencia', _es_dato_de_sede_referencia), ('gazetteer', es_dato_de_sede)):
+        mejor = float('inf')
+        for _ in range(repeticiones):
+            t0 = time.perf_counter()
+            for f in filas:
+                fn(f)
+            mejor = min(mejor, time.perf_counter() - t0)
+        tiempos[nombre] = mejor
+
+    tiempos['aceleracion'] = tiempos['referencia'] / tiempos['gazetteer'] if tiempos['gazetteer'] else float('inf')
+    print(f"📊 es_dato_de_sede sobre {n_filas:,} filas ({sum(esperados):,} de sede): "
+          f"referencia {tiempos['referencia']*1000:.0f} ms | gazetteer {tiempos['gazetteer']*1000:.0f} ms | "
+          f"x{tiempos['aceleracion']:.1f}")
+    return tiempos
+
+
+def _normalizar_texto_referencia(texto) -> str:
+    """Implementación anterior de normalizar_texto (replace encadenados), congelada para el benchmark."""
+    if texto is None:
+        return ""
+    t = str(texto).upper().strip()
+    for k, v in {'Á':'A','É':'E','Í':'I','Ó':'O','Ú':'U','Ñ':'N','Ü':'U'}.items():
+        t = t.replace(k, v)
+    return re.sub(r'[^A-Z0-9\s]', ' ', t).strip()
+
+
+def benchmark_normalizar_texto(repeticiones=200, n_aleatorios=30000, semilla=7):
+    """🆕 v15.2: normalizar_texto (translate + LRU) contra la implementación anterior.
+    1) Equivalencia sobre encabezados reales de ANEXO 1, los patrones de columnas
+       y n_aleatorios textos generados con semilla fija.
+    2) Tiempo sobre la mezcla de llamadas de detectar_columnas (celdas × patrones).
+    """
+    import random
+    import time
+
+    rnd = random.Random(semilla)
+    alfabeto = "abcdefghijklmnñopqrstuvwxyzABCDEFGHIJKLMNÑOPQRSTUVWXYZáéíóúüÁÉÍÓÚÜ0123456789 .,;:-_/#$%()\t"
+    aleatorios = [''.join(rnd.choice(alfabeto) for _ in range(rnd.randint(0, 40))) for _ in range(n_aleatorios)]
+    aleatorios += [None, 0, 890201, 35000.0, -1.5]
+    distintos = [x for x in aleatorios if normalizar_texto(x) != _normalizar_texto_referencia(x)]
+    assert not distintos, f"normalizar_texto difiere de la referencia en {len(distintos)} textos, p. ej. {distintos[0]!r}"
+
+    encabezados = [
+        ['CÓDIGO CUPS', 'CÓDIGO HOMÓLOGO MANUAL', 'DESCRIPCIÓN DEL CUPS', 'TARIFA UNITARIA EN PESOS',
+         'MANUAL TARIFARIO', 'TARIFA SEGÚN TARIFARIO', 'OBSERVACIONES'],
+        ['ITEM', 'COD. CUPS', 'DESCRIPCION CUPS', 'VALOR UNITARIO', 'TIPO DE TARIFARIO', '% DEL TARIFARIO', 'NOTAS'],
+        ['DEPARTAMENTO', 'MUNICIPIO', 'CÓDIGO DE HABILITACIÓN', 'NÚMERO DE SEDE', 'NOMBRE DE LA SEDE',
+         'DIRECCIÓN', 'TELÉFONO', 'EMAIL'],
+        ['No.', 'Código CUPS', 'Descripción del CUP', 'Tarifa Unitaria ($)', 'Manual Tarifario (SOAT/ISS)',
+         'Porcentaje', 'Observación', None, 890201, 35000.0],
+    ]
+    llamadas = [c for fila in encabezados for c in fila]
+    llamadas += [p for _, patrones in PATRONES_COLUMNAS_SERVICIOS for p in patrones] * len(encabezados)
+    assert [normalizar_texto(x) for x in llamadas] == [_normalizar_texto_referencia(x) for x in llamadas], \
+        "normalizar_texto difiere de la referencia en encabezados/patrones"
+
+    _normalizar_cadena.cache_clear()
+    tiempos = {}
+    for nombre, fn in (('referencia', _normalizar_texto_referencia), ('translate_lru', normalizar_texto)):
+        t0 = time.perf_counter()
+        for _ in range(repeticiones):
+            for x in llamadas:
+                fn(x)
+        tiempos[nombre] = time.perf_counter() - t0
+
+    tiempos['aceleracion'] = tiempos['referencia'] / tiempos['translate_lru'] if tiempos['translate_lru'] else float('inf')
+    print(f"📊 normalizar_texto: {len(aleatorios):,} textos equivalentes | {len(llamadas) * repeticiones:,} llamadas: "
+          f"referencia {tiempos['referencia']*1000:.0f} ms | translate+LRU {tiempos['translate_lru']*1000:.0f} ms | "
+          f"x{tiempos['aceleracion']:.1f}")
+    return tiempos
+
+
 # ══════════════════════════════════════════════════════════════════════════════
 # EJEMPLO DE USO EN EL PROCESADOR
 # ══════════════════════════════════════════════════════════════════════════════
@@ -1178,7 +1314,7 @@ print("🚀 Inicializando CONSOLIDADOR T25 v14.1...")
 print("=" * 70)
 
 # Instalación silenciosa de dependencias
-!pip install pyxlsb openpyxl pandas paramiko xlrd tqdm -q
+!pip install pyxlsb openpyxl pandas paramiko asyncssh xlrd tqdm -q
 
 import warnings
 warnings.filterwarnings('ignore')
@@ -1188,6 +1324,7 @@ from datetime import datetime, timedelta
 from typing import List, Optional, Dict, Any, Tuple, Callable
 from enum import Enum
 from dataclasses import dataclass, field
+import threading
 import time
 
 # ══════════════════════════════════════════════════════════════════════════════
@@ -1213,10 +1350,16 @@ class Logger:
 
     def __init__(self, verbose: bool = True):
         self.verbose = verbose
-        self.indent_level = 0
+        # 🆕 v15.2: Indentación y contrato por hilo (modo pool de sesiones)
+        self._local = threading.local()
+        self._lock = threading.RLock()
         self.logs: List[Dict] = []
+        # 🆕 v15.2: Si es una lista, las líneas se acumulan ahí en vez de imprimirse
+        # (procesos de parseo: el padre las reimprime)
+        self.capturadas: Optional[List[str]] = None
+        # 🆕 v15.2: Transferencias por archivo (nombre, bytes, segundos)
+        self.transferencias: List[Dict] = []
         self.start_time = time.time()
-        self.current_contract = ""
         self.stats = {
             'contratos_procesados': 0,
             'contratos_exitosos': 0,
@@ -1225,6 +1368,27 @@ class Logger:
             'alertas_generadas': 0
         }
 
+    @property
+    def indent_level(self) -> int:
+        return getattr(self._local, 'indent_level', 0)
+
+    @indent_level.setter
+    def indent_level(self, valor: int):
+        self._local.indent_level = valor
+
+    @property
+    def current_contract(self) -> str:
+        return getattr(self._local, 'current_contract', "")
+
+    @current_contract.setter
+    def current_contract(self, valor: str):
+        self._local.current_contract = valor
+
+    def incrementar(self, clave: str, cantidad=1):
+        """🆕 v15.2: Incrementa una estadística de forma segura entre hilos."""
+        with self._lock:
+            self.stats[clave] = self.stats.get(clave, 0) + cantidad
+
     def _get_timestamp(self) -> str:
         return datetime.now().strftime("%H:%M:%S")
 
@@ -1248,14 +1412,26 @@ class Logger:
         detail_str = f" → {details}" if details else ""
 
         line = f"{indent}{icon} {time_str}{message}{detail_str}"
-        print(line)
+        with self._lock:
+            if self.capturadas is not None:
+                self.capturadas.append(line)
+            else:
+                print(line)
 
-        self.logs.append({
-            'time': self._get_timestamp(),
-            'level': level.name,
-            'message': message,
-            'details': details
-        })
+            self.logs.append({
+                'time': self._get_timestamp(),
+                'level': level.name,
+                'message': message,
+                'details': details
+            })
+
+    def reemitir(self, lineas: List[str], registros: List[Dict]):
+        """🆕 v15.2: Imprime y registra líneas generadas en otro proceso, con la indentación actual."""
+        prefijo = self._format_indent()
+        with self._lock:
+            for linea in lineas:
+                print(f"{prefijo}{linea}")
+            self.logs.extend(registros)
 
     def set_contract(self, contract_id: str):
         self.current_contract = contract_id
@@ -1289,15 +1465,16 @@ class Logger:
     def contract_start(self, idx: int, total: int, contract_id: str):
         self.reset_indent()
         self.current_contract = contract_id
-        self.stats['contratos_procesados'] += 1
+        self.incrementar('contratos_procesados')
 
         progress_pct = (idx / total) * 100
         bar_filled = int(progress_pct / 5)
         bar = "█" * bar_filled + "░" * (20 - bar_filled)
 
-        print(f"\n┌{'─' * 68}┐")
-        print(f"│ 📋 CONTRATO [{idx}/{total}] {contract_id:<20} [{bar}] {progress_pct:>5.1f}% │")
-        print(f"└{'─' * 68}┘")
+        with self._lock:
+            print(f"\n┌{'─' * 68}┐")
+            print(f"│ 📋 CONTRATO [{idx}/{total}] {contract_id:<20} [{bar}] {progress_pct:>5.1f}% │")
+            print(f"└{'─' * 68}┘")
 
     def contract_end(self, success: bool, registros: int, tiempo: float, mensaje: str = ""):
         self.reset_indent()
@@ -1305,13 +1482,14 @@ class Logger:
         status = "ÉXITO" if success else "FALLO"
 
         if success:
-            self.stats['contratos_exitosos'] += 1
-            self.stats['servicios_extraidos'] += registros
+            self.incrementar('contratos_exitosos')
+            self.incrementar('servicios_extraidos', registros)
 
-        print(f"    ├── {icon} {status}: {registros:,} servicios en {tiempo:.1f}s")
-        if mensaje and not success:
-            print(f"    └── 💬 {mensaje}")
-        print()
+        with self._lock:
+            print(f"    ├── {icon} {status}: {registros:,} servicios en {tiempo:.1f}s")
+            if mensaje and not success:
+                print(f"    └── 💬 {mensaje}")
+            print()
 
     def nav(self, path: str, found: bool = True):
         icon = "📂" if found else "📁"
@@ -1337,12 +1515,23 @@ class Logger:
     def file_found(self, filename: str, file_type: str = ""):
         type_str = f"[{file_type}] " if file_type else ""
         self._print(LogLevel.FILE, f"Encontrado: {type_str}{filename}", show_time=False)
-        self.stats['archivos_descargados'] += 1
+        self.incrementar('archivos_descargados')
 
     def download(self, filename: str, size: str = ""):
         size_str = f" ({size})" if size else ""
         self._print(LogLevel.DOWNLOAD, f"Descargando: {filename}{size_str}", show_time=False)
 
+    def transfer(self, filename: str, n_bytes: int, segundos: float):
+        """🆕 v15.2: Registra el throughput de una descarga."""
+        velocidad = n_bytes / max(segundos, 1e-6)
+        with self._lock:
+            self.transferencias.append({'archivo': filename, 'bytes': n_bytes, 'segundos': round(segundos, 3),
+                                        'bytes_por_seg': round(velocidad)})
+        self.incrementar('bytes_transferidos', n_bytes)
+        self.incrementar('segundos_transferencia', segundos)
+        self._print(LogLevel.DEBUG, f"{filename}: {n_bytes/1024:.0f} KB en {segundos:.1f}s",
+                    f"{velocidad/1024:.0f} KB/s", show_time=False)
+
     def process(self, action: str, detail: str = ""):
         self._print(LogLevel.PROCESS, action, detail, show_time=False)
 
@@ -1362,7 +1551,7 @@ class Logger:
         self._print(LogLevel.DEBUG, message, detail, show_time=False)
 
     def alert(self, alert_type: str, message: str, archivo: str = ""):
-        self.stats['alertas_generadas'] += 1
+        self.incrementar('alertas_generadas')
         archivo_str = f" en {archivo}" if archivo else ""
         self._print(LogLevel.ALERT, f"[{alert_type}] {message}{archivo_str}", show_time=False)
 
@@ -1384,6 +1573,8 @@ class Logger:
 
     📊 Servicios extraídos: {self.stats['servicios_extraidos']:,}
 
+    ⬇️  Transferido: {self.stats.get('bytes_transferidos', 0)/1024/1024:.1f} MB a {self.stats.get('bytes_transferidos', 0)/1024/max(self.stats.get('segundos_transferencia', 0), 1e-6):.0f} KB/s promedio
+
     🔔 Alertas generadas: {self.stats['alertas_generadas']}
 """)
         print('═' * 70)
@@ -1413,18 +1604,28 @@ LOG.step(1, 6, "CARGANDO CONFIGURACIÓN")
 from google.colab import files
 import pandas as pd
 import numpy as np
+import hashlib
+import json
+import asyncio
 import os
+import posixpath
+import sqlite3
+import queue
 import re
 import shutil
 import threading
 import zipfile
-from typing import List, Optional, Tuple, Dict, Any, Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple, Dict, Any, Callable, Set
 from datetime import datetime, timedelta
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, asdict
 from enum import Enum, auto
 import time
 import paramiko
 import stat
+from collections import OrderedDict, deque
+from functools import cached_property, lru_cache
+import multiprocessing
 from difflib import SequenceMatcher
 
 LOG.indent()
@@ -1453,12 +1654,72 @@ class Config:
     CONTRATOS_PROBLEMATICOS: set = field(default_factory=lambda: {'572-2023'})
     TIMEOUT_CONTRATOS_PROBLEMATICOS: int = 30
     MAX_SEDES: int = 50
+    # 🆕 v15.2: Filas que puede mirar hacia adelante el bloque de sedes (acota memoria)
+    MAX_LOOKAHEAD_SEDES: int = 2000
+    # 🆕 v15.2: Textos distintos memorizados por normalizar_texto (LRU)
+    CACHE_NORMALIZAR_MAX: int = 50000
+    # 🆕 v15.2: Filas candidatas por lote de validación vectorizada (validar_servicios_lote)
+    LOTE_VALIDACION: int = 256
+    # 🆕 v15.2: Filas seguidas vacías/sin CUPS tras los servicios que cierran la tabla
+    # (0 = no cortar). Cada corte genera una alerta TABLA_CORTADA
+    FIN_TABLA_FILAS_VACIAS: int = 0
+    # 🆕 v15.2: Antes de cortar se miran N filas más; si aparece otro encabezado se sigue leyendo
+    FIN_TABLA_VENTANA_ENCABEZADOS: int = 500
+    # 🆕 v15.2: Tras el encabezado de servicios solo se leen las columnas usadas
+    # (mínimo N, para no perder encabezados ni datos de sede; 0 = leer todas)
+    COLUMNAS_MINIMAS_PROYECCION: int = 16
+    # 🆕 v15.2: Parseo en procesos aparte (timeout real: el proceso se termina y se reemplaza).
+    # Solo parsea en paralelo con PREFETCH_CONTRATOS > 0 o varias sesiones
+    PARSEO_EN_PROCESOS: bool = False
+    MAX_PROCESOS_PARSEO: int = 2
+    # 🆕 v15.2: Procesos de reserva creados al inicio para reemplazar los terminados por timeout.
+    # No se hace fork con hilos activos: agotada la reserva, el parseo vuelve a hilos
+    REPUESTOS_PARSEO: int = 2
+    # 🆕 v15.2: Contratos descargados en espera de parseo (pipeline; 0 = sin pipeline, serial)
+    PREFETCH_CONTRATOS: int = 0
+    # 🆕 v15.2: Implementación del cliente SFTP: 'paramiko' (bloqueante) o 'asyncio' (asyncssh)
+    CLIENTE_SFTP: str = 'paramiko'
+    # 🆕 v15.2: Segundos tras una operación exitosa en que la conexión se da por viva sin sondear
+    VENTANA_ACTIVIDAD_SFTP: int = 30
+    # 🆕 v15.2: Reciclaje de conexiones por salud (reemplaza "reconectar cada 10 contratos")
+    RECICLAR_EDAD_MAX_S: int = 1800
+    RECICLAR_MAX_MB: int = 500
+    RECICLAR_VENTANA_OPS: int = 20
+    RECICLAR_TASA_ERRORES: float = 0.3
+    # 🆕 v15.2: Descarga por bloques con lecturas anticipadas (prefetch) en paralelo
+    SFTP_BLOQUE_KB: int = 32
+    SFTP_VENTANA_PREFETCH: int = 64
+    # 🆕 v15.2: Índice SQLite del árbol de contratos (0 horas = deshabilitado). Solo sirve
+    # listados hechos en la ejecución actual, y como máximo por N horas dentro de ella
+    ARCHIVO_INDICE_REMOTO: str = './indice_goanywhere.sqlite'
+    INDICE_REMOTO_MAX_HORAS: float = 6
+    INDICE_REMOTO_PROFUNDIDAD: int = 3  # contrato / TARIFAS / actas
+    INDICE_REMOTO_MIN_CONTRATOS: int = 20  # barrido solo si se procesan al menos N contratos
+    CONEXIONES_ASYNC: int = 2
+    # 🆕 v15.2: Sesiones SFTP simultáneas (1 = secuencial). Subir solo si GoAnywhere lo tolera.
+    MAX_SESIONES_SFTP: int = 1
+    # 🆕 v15.2: Cache de listados remotos (TTL en segundos, 0 = deshabilitado)
+    CACHE_LISTADOS_TTL: int = 900
+    CACHE_LISTADOS_MAX: int = 512
+    # 🆕 v15.2: Cache persistente de descargas (ruta + tamaño + fecha), 0 MB = deshabilitada
+    CARPETA_CACHE_DESCARGAS: str = './cache_descargas'
+    CACHE_DESCARGAS_MAX_MB: int = 2048
+    # 🆕 v15.2: Modo incremental - reutiliza lo extraído de archivos sin cambios
+    # (el manifiesto se descarta si cambian VERSION_PARSER o la configuración de extracción)
+    MODO_INCREMENTAL: bool = False
+    ARCHIVO_MANIFIESTO: str = './manifiesto_ejecucion.json'
+    # 🆕 v15.2: Checkpoint por contrato; REANUDAR=None pregunta si hay uno pendiente
+    REANUDAR: Optional[bool] = None
 
 CONFIG = Config()
 
+# 🆕 v15.2: Versión de la lógica de extracción; subirla invalida los manifiestos anteriores
+VERSION_PARSER = '15.2'
+
 LOG.info("Configuración SFTP", f"{CONFIG.HOST}:{CONFIG.PORT}")
 LOG.info("Timeout por archivo", f"{CONFIG.TIMEOUT_ARCHIVO}s")
 LOG.info("Máximo de sedes", f"{CONFIG.MAX_SEDES}")
+LOG.info("Sesiones SFTP simultáneas", f"{CONFIG.MAX_SESIONES_SFTP}")
 
 # ══════════════════════════════════════════════════════════════════════════════
 # ENUMERACIONES Y CLASES DE DATOS
@@ -1493,6 +1754,8 @@ class TipoAlerta(Enum):
     # 🆕 v14.1
     CONTRATO_NO_ENCONTRADO_GO = "CONTRATO_NO_ENCONTRADO_GO"
     FECHA_FALTANTE_MAESTRA = "FECHA_FALTANTE_MAESTRA"
+    # 🆕 v15.2
+    TABLA_CORTADA = "TABLA_CORTADA"
 
 class PrioridadAlerta(Enum):
     CRITICA = 1
@@ -1553,6 +1816,10 @@ ALERTAS_CONFIG = {
         'prioridad': PrioridadAlerta.CRITICA,
         'sugerencia': 'El contrato no existe en GoAnywhere - verificar número y año'
     },
+    TipoAlerta.TABLA_CORTADA: {
+        'prioridad': PrioridadAlerta.ALTA,
+        'sugerencia': 'La lectura de la hoja se detuvo antes del final - revisar filas posteriores o usar FIN_TABLA_FILAS_VACIAS = 0'
+    },
 }
 
 @dataclass
@@ -1603,6 +1870,9 @@ class ArchivoAnexo:
     numero: Optional[int] = None
     fecha_modificacion: Optional[float] = None
     origen_completo: str = ""  # 🆕 v14.1
+    ruta_remota: str = ""  # 🆕 v15.2
+    tamano: Optional[int] = None  # 🆕 v15.2
+    reutilizado: bool = False  # 🆕 v15.2: no se descargó, se toma del manifiesto
 
     @property
     def origen_texto(self) -> str:
@@ -1610,6 +1880,187 @@ class ArchivoAnexo:
             return f"{self.origen.value} {self.numero}"
         return self.origen.value
 
+@dataclass
+class ResultadoContrato:
+    """🆕 v15.2: Resultado de un contrato; se fusiona en orden de CONTRATOS_A_PROCESAR."""
+    idx: int
+    contrato: str
+    servicios: List[Dict] = field(default_factory=list)
+    alertas: List[Dict] = field(default_factory=list)
+    resumen: Dict = field(default_factory=dict)
+    no_positiva: List[Dict] = field(default_factory=list)
+    fechas_ok: int = 0
+    fechas_no: int = 0
+    sin_fecha: bool = False
+    # 🆕 v15.2: Falla transitoria (conexión, excepción): no va al checkpoint y se reintenta al reanudar
+    reintentar: bool = False
+
+@dataclass
+class ContratoDescargado:
+    """🆕 v15.2: Contrato con sus anexos ya en disco, listo para la etapa de parseo."""
+    resultado: ResultadoContrato
+    numero: str
+    ano: str
+    carpeta: str = ""
+    archivos: List[ArchivoAnexo] = field(default_factory=list)
+    previos: Dict[str, Dict] = field(default_factory=dict)
+    categoria_cuentas_medicas: str = ""
+    es_ambulancia: bool = False
+    t_inicio: float = 0.0
+    listo: bool = False  # False = falló antes de parsear; resultado ya está completo
+
+
+def valor_a_json(valor):
+    """🆕 v15.2: Conversión por defecto para json.dump (tipos numpy, fechas, etc.)."""
+    if hasattr(valor, 'item'):
+        return valor.item()
+    return str(valor)
+
+
+class ManifiestoEjecucion:
+    """🆕 v15.2: Manifiesto persistente de la última ejecución.
+    Por contrato guarda los archivos elegidos (ruta remota, tamaño, fecha) con sus
+    servicios extraídos, para no volver a descargar ni parsear lo que no cambió.
+    """
+
+    # Campos de Config que cambian lo que se extrae de un archivo
+    CAMPOS_CONFIG = ('MAX_SEDES', 'MAX_LOOKAHEAD_SEDES', 'FIN_TABLA_FILAS_VACIAS', 'FIN_TABLA_VENTANA_ENCABEZADOS',
+                     'COLUMNAS_MINIMAS_PROYECCION')
+
+    def __init__(self, ruta: str, config: Config):
+        self.ruta = ruta
+        self._lock = threading.Lock()
+        self._contratos: Dict[str, Dict] = {}
+        self.archivos_reutilizados = 0
+        self.archivos_procesados = 0
+        self.firma = self.firma_extraccion(config)
+        # Motivo por el que se ignoró el manifiesto existente ('' si se cargó o no había)
+        self.descartado = ''
+        try:
+            with open(self.ruta, 'r', encoding='utf-8') as f:
+                datos = json.load(f)
+        except Exception:
+            return
+        if datos.get('version') != VERSION_PARSER:
+            self.descartado = f"versión {datos.get('version')} ≠ {VERSION_PARSER}"
+        elif datos.get('firma') != self.firma:
+            self.descartado = "cambió la configuración de extracción"
+        else:
+            self._contratos = datos.get('contratos', {})
+
+    @classmethod
+    def firma_extraccion(cls, config: Config) -> str:
+        """Hash de VERSION_PARSER y de los campos de Config que afectan la extracción."""
+        valores = {'version': VERSION_PARSER, **{c: getattr(config, c) for c in cls.CAMPOS_CONFIG}}
+        return hashlib.sha1(json.dumps(valores, sort_keys=True).encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def clave_archivo(ruta_remota: str, tamano: Optional[int], mtime: Optional[float]) -> Optional[str]:
+        if not ruta_remota or tamano is None or mtime is None:
+            return None
+        return f"{ruta_remota}|{int(tamano)}|{int(mtime)}"
+
+    def archivos_previos(self, contrato: str, categoria: str = "") -> Dict[str, Dict]:
+        """Entradas de la ejecución anterior indexadas por clave de archivo.
+        Si cambió la categoría de cuentas médicas del contrato no se reutiliza nada.
+        """
+        with self._lock:
+            entrada = self._contratos.get(contrato, {})
+            if entrada.get('categoria', '') != (categoria or ''):
+                return {}
+            return {a['clave']: a for a in entrada.get('archivos', [])}
+
+    def registrar_contrato(self, contrato: str, archivos: List[Dict], reutilizados: int, categoria: str = ""):
+        with self._lock:
+            self._contratos[contrato] = {
+                'categoria': categoria or '',
+                'archivos': archivos,
+                'filas': sum(len(a['servicios']) for a in archivos),
+                'actualizado': datetime.now().isoformat(timespec='seconds')
+            }
+            self.archivos_reutilizados += reutilizados
+            self.archivos_procesados += len(archivos) - reutilizados
+
+    def guardar(self):
+        with self._lock:
+            tmp = self.ruta + '.tmp'
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump({'version': VERSION_PARSER, 'firma': self.firma, 'contratos': self._contratos}, f, default=valor_a_json)
+            os.replace(tmp, self.ruta)
+
+    def resumen(self) -> str:
+        return f"{self.archivos_reutilizados} archivos reutilizados, {self.archivos_procesados} procesados"
+
+
+class CheckpointContratos:
+    """🆕 v15.2: Checkpoint en disco de los ResultadoContrato ya terminados.
+    Un JSON por línea, escrito al terminar cada contrato; la primera línea guarda la
+    firma de la lista de contratos para no mezclar ejecuciones distintas.
+    Los resultados marcados con reintentar no se guardan: al reanudar se procesan de nuevo.
+    """
+
+    def __init__(self, ruta: str, ids_contratos: List[str]):
+        self.ruta = ruta
+        self.firma = hashlib.sha1('\n'.join(ids_contratos).encode('utf-8')).hexdigest()
+        self._lock = threading.Lock()
+        self._archivo = None
+
+    def cargar(self) -> Dict[int, ResultadoContrato]:
+        """Resultados completos del checkpoint (vacío si no existe o es de otra selección)."""
+        resultados = {}
+        try:
+            with open(self.ruta, 'r', encoding='utf-8') as f:
+                cabecera = json.loads(f.readline() or '{}')
+                if cabecera.get('firma') != self.firma:
+                    return {}
+                for linea in f:
+                    try:
+                        datos = json.loads(linea)
+                    except ValueError:
+                        break  # Última línea a medio escribir
+                    if datos.get('reintentar'):
+                        continue
+                    resultados[datos['idx']] = ResultadoContrato(**datos)
+        except FileNotFoundError:
+            pass
+        return resultados
+
+    def abrir(self, reanudar: bool):
+        """Abre el checkpoint para escritura; si no se reanuda, lo reinicia."""
+        if reanudar and os.path.exists(self.ruta):
+            previos = self.cargar()
+            # Reescribir solo lo válido (descarta una línea final incompleta)
+            self._archivo = open(self.ruta, 'w', encoding='utf-8')
+            self._escribir({'firma': self.firma})
+            for idx in sorted(previos):
+                self._escribir(asdict(previos[idx]))
+        else:
+            self._archivo = open(self.ruta, 'w', encoding='utf-8')
+            self._escribir({'firma': self.firma})
+
+    def _escribir(self, datos: Dict):
+        self._archivo.write(json.dumps(datos, default=valor_a_json) + '\n')
+        self._archivo.flush()
+        os.fsync(self._archivo.fileno())
+
+    def registrar(self, r: ResultadoContrato):
+        if r.reintentar:
+            return
+        with self._lock:
+            if self._archivo:
+                self._escribir(asdict(r))
+
+    def finalizar(self):
+        """Cierra y elimina el checkpoint una vez generados los archivos finales."""
+        with self._lock:
+            if self._archivo:
+                self._archivo.close()
+                self._archivo = None
+            try:
+                os.remove(self.ruta)
+            except OSError:
+                pass
+
 LOG.success("Clases y configuración definidas")
 LOG.dedent()
 
@@ -1675,136 +2126,216 @@ def leer_excel(ruta: str, sheet_name=0, header=0, engine=None):
     raise Exception(f"No se pudo leer: {ruta}")
 
 
-def obtener_hojas(ruta: str) -> List[str]:
-    """Obtiene lista de hojas de un archivo Excel."""
-    formato = detectar_formato_real(ruta)
-    ext = os.path.splitext(ruta)[1].lower()
+class WorkbookReader:
+    """🆕 v15.2: Libro Excel abierto una sola vez.
+    Detecta el formato real una vez, abre el libro con el motor adecuado y sirve
+    nombres de hojas y filas desde el mismo handle. Usar con `with`.
+    """
+
+    MOTOR_POR_FORMATO = {'xlsb': 'pyxlsb', 'xlsx': 'openpyxl', 'xls_old': 'xlrd'}
+    MOTOR_POR_EXTENSION = {'.xlsb': 'pyxlsb', '.xls': 'xlrd'}
+
+    def __init__(self, ruta: str):
+        self.ruta = ruta
+        self.formato = detectar_formato_real(ruta)
+        self.ext = os.path.splitext(ruta)[1].lower()
+        self.motor: Optional[str] = None
+        self._wb = None
+        self._hojas: Optional[List[str]] = None
+        # 🆕 v15.2: Proyección de columnas; se puede cambiar mientras se itera
+        self.max_columnas: Optional[int] = None
+
+    def __enter__(self):
+        return self
 
-    if formato == 'xlsb':
+    def __exit__(self, *exc):
+        self.cerrar()
+        return False
+
+    def _abrir(self):
+        """Abre con el motor del formato real y, si falla, con el de la extensión."""
+        if self._hojas is not None:
+            return
+        self._hojas = []
+        candidatos = []
+        for motor in (self.MOTOR_POR_FORMATO.get(self.formato),
+                      self.MOTOR_POR_EXTENSION.get(self.ext, 'openpyxl')):
+            if motor and motor not in candidatos:
+                candidatos.append(motor)
+
+        for motor in candidatos:
+            try:
+                if motor == 'pyxlsb':
+                    from pyxlsb import open_workbook
+                    wb = open_workbook(self.ruta)
+                    hojas = list(wb.sheets)
+                elif motor == 'openpyxl':
+                    from openpyxl import load_workbook
+                    wb = load_workbook(self.ruta, read_only=True, data_only=True)
+                    hojas = wb.sheetnames
+                else:
+                    import xlrd
+                    wb = xlrd.open_workbook(self.ruta, on_demand=True)
+                    hojas = wb.sheet_names()
+            except Exception:
+                continue
+            self._wb, self._hojas, self.motor = wb, hojas, motor
+            return
+
+    @property
+    def hojas(self) -> List[str]:
+        self._abrir()
+        return self._hojas
+
+    def proyectar_columnas(self, max_columnas: Optional[int]):
+        """Limita las filas siguientes a las primeras max_columnas columnas (None = todas)."""
+        self.max_columnas = max_columnas
+
+    def iterar_filas(self, hoja: str, max_filas: int = 50000):
+        """Genera las filas de la hoja como listas de valores."""
+        self._abrir()
+        if self._wb is None:
+            return
+        if self.motor == 'pyxlsb':
+            with self._wb.get_sheet(hoja) as sheet:
+                for i, row in enumerate(sheet.rows()):
+                    if i >= max_filas:
+                        break
+                    yield [cell.v for cell in row[:self.max_columnas]]
+        elif self.motor == 'openpyxl':
+            # max_col: openpyxl arma la tupla de valores solo hasta esa columna. Si la
+            # proyección cambia, el iterador se reabre desde la fila siguiente.
+            ws = self._wb[hoja]
+            i = 0
+            while i < max_filas:
+                columnas = self.max_columnas
+                for row in ws.iter_rows(min_row=i + 1, max_col=columnas, values_only=True):
+                    if i >= max_filas:
+                        return
+                    yield list(row)
+                    i += 1
+                    if self.max_columnas != columnas:
+                        break
+                else:
+                    return
+        else:
+            sheet = self._wb.sheet_by_name(hoja)
+            for r in range(min(sheet.nrows, max_filas)):
+                n_cols = min(sheet.ncols, self.max_columnas or sheet.ncols)
+                yield [sheet.cell_value(r, c) for c in range(n_cols)]
+
+    def fila_completa(self, hoja: str, idx: int) -> List:
+        """Relee la fila idx (base 0) con todas sus columnas, sin proyección."""
+        self._abrir()
         try:
-            from pyxlsb import open_workbook
-            with open_workbook(ruta) as wb:
-                return list(wb.sheets)
+            if self.motor == 'openpyxl':
+                return list(next(self._wb[hoja].iter_rows(min_row=idx + 1, max_row=idx + 1, values_only=True), ()))
+            if self.motor == 'pyxlsb':
+                with self._wb.get_sheet(hoja) as sheet:
+                    for k, row in enumerate(sheet.rows()):
+                        if k == idx:
+                            return [cell.v for cell in row]
+            if self.motor == 'xlrd':
+                return self._wb.sheet_by_name(hoja).row_values(idx)
         except Exception:
             pass
+        return []
 
-    elif formato == 'xlsx':
+    def filas_declaradas(self, hoja: str) -> Optional[int]:
+        """Filas según la dimensión declarada de la hoja (None si el motor no la expone)."""
+        self._abrir()
         try:
-            from openpyxl import load_workbook
-            wb = load_workbook(ruta, read_only=True, data_only=True)
-            hojas = wb.sheetnames
-            wb.close()
-            return hojas
+            if self.motor == 'openpyxl':
+                return self._wb[hoja].max_row
+            if self.motor == 'xlrd':
+                return self._wb.sheet_by_name(hoja).nrows
         except Exception:
             pass
+        return None
 
-    elif formato == 'xls_old':
+    def leer_hoja(self, hoja: str, max_filas: int = 50000) -> List[List]:
+        """Lee la hoja completa como lista de listas ([] si no es legible)."""
         try:
-            import xlrd
-            wb = xlrd.open_workbook(ruta, on_demand=True)
-            return wb.sheet_names()
+            return list(self.iterar_filas(hoja, max_filas))
         except Exception:
-            pass
+            return []
 
-    # FALLBACK basado en extensión
-    if ext == '.xlsb':
-        try:
-            from pyxlsb import open_workbook
-            with open_workbook(ruta) as wb:
-                return list(wb.sheets)
-        except:
-            pass
-    elif ext == '.xls':
+    def cerrar(self):
+        if self._wb is None:
+            return
         try:
-            import xlrd
-            return xlrd.open_workbook(ruta).sheet_names()
-        except:
+            if self.motor == 'xlrd':
+                self._wb.release_resources()
+            else:
+                self._wb.close()
+        except Exception:
             pass
-    else:
+        self._wb = None
+
+
+class IteradorFilas:
+    """🆕 v15.2: Iterador de filas en streaming con buffer de look-ahead.
+    Entrega (índice, fila) y permite mirar filas siguientes sin consumirlas; solo
+    se retienen en memoria las filas miradas y aún no consumidas.
+    """
+
+    def __init__(self, filas):
+        self._fuente = iter(filas)
+        self._buffer = deque()
+        self._agotado = False
+        self.leidas = 0
+        self.error: Optional[Exception] = None
+
+    def _leer(self) -> bool:
+        if self._agotado:
+            return False
         try:
-            from openpyxl import load_workbook
-            wb = load_workbook(ruta, read_only=True)
-            hojas = wb.sheetnames
-            wb.close()
-            return hojas
-        except:
+            self._buffer.append(next(self._fuente))
+            return True
+        except StopIteration:
             pass
+        except Exception as e:
+            self.error = e
+        self._agotado = True
+        return False
 
-    return []
+    def __iter__(self):
+        return self
 
+    def __next__(self) -> Tuple[int, List]:
+        if not self._buffer and not self._leer():
+            raise StopIteration
+        idx = self.leidas
+        self.leidas += 1
+        return idx, self._buffer.popleft()
 
-def leer_hoja_raw(ruta: str, hoja: str, max_filas: int = 50000) -> List[List]:
-    """Lee hoja como lista de listas."""
-    formato = detectar_formato_real(ruta)
-    ext = os.path.splitext(ruta)[1].lower()
+    def adelante(self, max_filas: int = None):
+        """Genera las filas siguientes sin consumirlas (como máximo max_filas)."""
+        n = 0
+        while max_filas is None or n < max_filas:
+            if n >= len(self._buffer) and not self._leer():
+                return
+            yield self._buffer[n]
+            n += 1
 
-    try:
-        if formato == 'xlsb':
-            from pyxlsb import open_workbook
-            datos = []
-            with open_workbook(ruta) as wb:
-                with wb.get_sheet(hoja) as sheet:
-                    for i, row in enumerate(sheet.rows()):
-                        if i >= max_filas:
-                            break
-                        datos.append([cell.v for cell in row])
-            return datos
+    def vacio(self) -> bool:
+        return not self._buffer and not self._leer()
 
-        elif formato == 'xlsx':
-            from openpyxl import load_workbook
-            wb = load_workbook(ruta, read_only=True, data_only=True)
-            sheet = wb[hoja]
-            datos = []
-            for i, row in enumerate(sheet.iter_rows(values_only=True)):
-                if i >= max_filas:
-                    break
-                datos.append(list(row))
-            wb.close()
-            return datos
 
-        elif formato == 'xls_old':
-            import xlrd
-            wb = xlrd.open_workbook(ruta)
-            sheet = wb.sheet_by_name(hoja)
-            return [[sheet.cell_value(r, c) for c in range(sheet.ncols)]
-                    for r in range(min(sheet.nrows, max_filas))]
+def obtener_hojas(ruta: str) -> List[str]:
+    """Obtiene lista de hojas de un archivo Excel."""
+    with WorkbookReader(ruta) as wb:
+        return wb.hojas
 
-        else:
-            if ext == '.xlsb':
-                from pyxlsb import open_workbook
-                datos = []
-                with open_workbook(ruta) as wb:
-                    with wb.get_sheet(hoja) as sheet:
-                        for i, row in enumerate(sheet.rows()):
-                            if i >= max_filas:
-                                break
-                            datos.append([cell.v for cell in row])
-                return datos
-            elif ext == '.xls':
-                import xlrd
-                wb = xlrd.open_workbook(ruta)
-                sheet = wb.sheet_by_name(hoja)
-                return [[sheet.cell_value(r, c) for c in range(sheet.ncols)]
-                        for r in range(min(sheet.nrows, max_filas))]
-            else:
-                from openpyxl import load_workbook
-                wb = load_workbook(ruta, read_only=True, data_only=True)
-                sheet = wb[hoja]
-                datos = []
-                for i, row in enumerate(sheet.iter_rows(values_only=True)):
-                    if i >= max_filas:
-                        break
-                    datos.append(list(row))
-                wb.close()
-                return datos
 
-    except AssertionError:
-        return []
-    except Exception:
-        return []
+def leer_hoja_raw(ruta: str, hoja: str, max_filas: int = 50000) -> List[List]:
+    """Lee hoja como lista de listas."""
+    with WorkbookReader(ruta) as wb:
+        return wb.leer_hoja(hoja, max_filas)
 
 
 LOG.success("Funciones de lectura Excel")
+LOG.success("🆕 WorkbookReader: formato detectado y libro abierto una sola vez")
 
 
 # ══════════════════════════════════════════════════════════════════════════════
@@ -1931,14 +2462,29 @@ LOG.success("Funciones de clasificación de hojas")
 # FUNCIONES DE NORMALIZACIÓN Y LIMPIEZA
 # ══════════════════════════════════════════════════════════════════════════════
 
+# 🆕 v15.2: Tablas de traducción de normalizar_texto (derivadas de la regex original)
+_RE_NO_ALFANUMERICO = re.compile(r'[^A-Z0-9\s]')
+_TABLA_TILDES = str.maketrans('ÁÉÍÓÚÑÜ', 'AEIOUNU')
+_TABLA_ESPECIALES_ASCII = str.maketrans({
+    chr(c): ' ' for c in range(128) if _RE_NO_ALFANUMERICO.match(chr(c))
+})
+
+
+@lru_cache(maxsize=CONFIG.CACHE_NORMALIZAR_MAX)
+def _normalizar_cadena(t: str) -> str:
+    t = t.upper().strip().translate(_TABLA_TILDES)
+    if t.isascii():
+        return t.translate(_TABLA_ESPECIALES_ASCII).strip()
+    return _RE_NO_ALFANUMERICO.sub(' ', t).strip()
+
+
 def normalizar_texto(texto) -> str:
-    """Normaliza texto: mayúsculas, sin tildes, sin especiales."""
+    """Normaliza texto: mayúsculas, sin tildes, sin especiales.
+    🆕 v15.2: str.translate en vez de replace encadenados, memorizado por valor (LRU).
+    """
     if texto is None:
         return ""
-    t = str(texto).upper().strip()
-    for k, v in {'Á':'A','É':'E','Í':'I','Ó':'O','Ú':'U','Ñ':'N','Ü':'U'}.items():
-        t = t.replace(k, v)
-    return re.sub(r'[^A-Z0-9\s]', ' ', t).strip()
+    return _normalizar_cadena(str(texto))
 
 def similitud_texto(a: str, b: str) -> float:
     """Calcula similitud entre dos textos (0.0 a 1.0)."""
@@ -2035,6 +2581,72 @@ LOG.success("Funciones de detección de patrones")
 
 print("\n📌 CARGANDO VALIDACIÓN SEMÁNTICA v14.1...")
 
+
+def patron_trie(palabras) -> str:
+    """🆕 v15.2: Regex equivalente a la alternancia de palabras, con forma de trie.
+    Los prefijos comunes se comparten ('BOGOT(?:A|Á)...'), así el motor no
+    reintenta cada palabra desde cero; en cada nodo se prefiere continuar,
+    por lo que el match en una posición es siempre la palabra más larga.
+    """
+    trie = {}
+    for palabra in palabras:
+        if not palabra:
+            continue
+        nodo = trie
+        for ch in palabra:
+            nodo = nodo.setdefault(ch, {})
+        nodo[''] = {}
+
+    def _patron(nodo: Dict) -> str:
+        ramas = [re.escape(ch) + _patron(hijo) for ch, hijo in sorted(nodo.items()) if ch]
+        if not ramas:
+            return ''
+        cuerpo = ramas[0] if len(ramas) == 1 else '(?:' + '|'.join(ramas) + ')'
+        return f'(?:{cuerpo})?' if '' in nodo else cuerpo
+
+    return _patron(trie)
+
+
+class VocabularioCompilado:
+    """🆕 v15.2: Vocabulario de palabras clave compilado una sola vez.
+    Una regex en forma de trie (patron_trie) evaluada en cada posición da, en
+    una pasada, la palabra más larga que empieza ahí; las palabras contenidas
+    en ella se agregan por cierre precalculado. Así
+    encontrar(texto) == {p for p in palabras if p in texto}.
+    """
+
+    def __init__(self, palabras):
+        self.palabras = frozenset(palabras)
+        patron = patron_trie(self.palabras)
+        self.patron = patron
+        self._buscar = re.compile(patron) if patron else None
+        self._todas = re.compile(f'(?=({patron}))') if patron else None
+        self._implicadas = {p: frozenset(q for q in self.palabras if q in p) for p in self.palabras}
+
+    def encontrar(self, texto: str) -> Set[str]:
+        """Todas las palabras del vocabulario contenidas en texto."""
+        if not self._todas or not texto:
+            return set()
+        hits = set()
+        for m in self._todas.finditer(texto):
+            hits |= self._implicadas[m.group(1)]
+        return hits
+
+    def contiene(self, texto: str) -> bool:
+        return bool(self._buscar and texto and self._buscar.search(texto))
+
+    def contar(self, texto: str) -> int:
+        return len(self.encontrar(texto))
+
+    def es_exacta(self, texto: str) -> bool:
+        return texto in self.palabras
+
+
+def texto_fila(fila: list) -> str:
+    """🆕 v15.2: Texto de una fila en mayúsculas (celdas no nulas separadas por espacio)."""
+    return ' '.join([str(x).upper().strip() for x in fila if x is not None])
+
+
 # 🆕 v14.1: Lista COMPLETA de ciudades colombianas (incluye las usadas en traslados)
 CIUDADES_COLOMBIA_COMPLETA = {
     # Capitales
@@ -2133,6 +2745,15 @@ PATRONES_DIRECCION = [
     'BARRIO ', 'VEREDA ', 'SECTOR '
 ]
 
+# 🆕 v15.2: Gazetteer geográfico - "contiene algún departamento / municipio / patrón de dirección"
+VOCAB_DEPARTAMENTOS = VocabularioCompilado(DEPARTAMENTOS_COLOMBIA)
+VOCAB_MUNICIPIOS = VocabularioCompilado(MUNICIPIOS_COLOMBIA)
+VOCAB_DIRECCION = VocabularioCompilado(PATRONES_DIRECCION)
+
+# 🆕 v15.2: Palabras de encabezado de servicios (ver VOCAB_ENCABEZADOS_FILA)
+CUPS_ENCABEZADO_SERVICIOS = {'CODIGO CUPS', 'CÓDIGO CUPS'}
+OTRAS_ENCABEZADO_SERVICIOS = {'DESCRIPCION', 'TARIFA', 'TARIFARIO', 'ESPECIALIDAD'}
+
 # 🆕 v14.1 - Hojas a excluir SILENCIOSAMENTE (sin generar alerta)
 HOJAS_EXCLUIR = {
     'INSTRUCCIONES', 'INFO', 'DATOS', 'CONTENIDO', 'INDICE', 'ÍNDICE',
@@ -2161,6 +2782,9 @@ PATRONES_PAQUETES = [
     'PAQUETE',
 ]
 
+# 🆕 v15.2: Patrones de exclusión + paquetes en un solo vocabulario
+VOCAB_EXCLUIR_HOJA = VocabularioCompilado(PATRONES_EXCLUIR_HOJA + PATRONES_PAQUETES)
+
 PALABRAS_HOJA_SERVICIOS_ALTA = [
     'TARIFA DE SERV',
     'TARIFAS DE SERV',
@@ -2190,17 +2814,9 @@ def debe_excluir_hoja(nombre_hoja: str) -> bool:
     if nombre_upper in HOJAS_SIN_SERVICIOS_VALIDOS:
         return True
 
-    # Verificar patrones de exclusión
-    for patron in PATRONES_EXCLUIR_HOJA:
-        if patron in nombre_upper:
-            return True
-
-    # 🆕 v14.1: Verificar patrones de PAQUETES
-    for patron in PATRONES_PAQUETES:
-        if patron in nombre_upper:
-            return True
-
-    return False
+    # Verificar patrones de exclusión y 🆕 v14.1 de PAQUETES
+    # 🆕 v15.2: Una sola búsqueda sobre el vocabulario compilado
+    return VOCAB_EXCLUIR_HOJA.contiene(nombre_upper)
 
 
 def obtener_hojas_excluidas_info(hojas: List[str]) -> List[Tuple[str, str]]:
@@ -2296,59 +2912,34 @@ def buscar_hoja_servicios_inteligente(hojas: List[str]) -> Tuple[Optional[str],
 
 
 def es_encabezado_seccion_sedes(fila: list) -> bool:
-    """Detecta si una fila es el ENCABEZADO de la sección de SEDES."""
+    """Detecta si una fila es el ENCABEZADO de la sección de SEDES.
+    🆕 v15.2: fila puede ser una lista o un RowFeatures.
+    """
     if not fila:
         return False
 
-    fila_texto = ' '.join([str(x).upper().strip() for x in fila if x is not None])
-
-    contador = 0
-    for palabra in PALABRAS_ENCABEZADO_SEDES:
-        if palabra in fila_texto:
-            contador += 1
-
-    return contador >= 3
+    return len(RowFeatures.de(fila).hits & PALABRAS_ENCABEZADO_SEDES) >= 3
 
 
 def es_encabezado_seccion_servicios(fila: list) -> bool:
-    """Detecta si una fila es el ENCABEZADO de la sección de SERVICIOS."""
+    """Detecta si una fila es el ENCABEZADO de la sección de SERVICIOS.
+    🆕 v15.2: fila puede ser una lista o un RowFeatures.
+    """
     if not fila:
         return False
 
-    fila_texto = ' '.join([str(x).upper().strip() for x in fila if x is not None])
-
-    tiene_cups = 'CODIGO CUPS' in fila_texto or 'CÓDIGO CUPS' in fila_texto
-    tiene_otra = any(p in fila_texto for p in ['DESCRIPCION', 'TARIFA', 'TARIFARIO', 'ESPECIALIDAD'])
-
-    return tiene_cups and tiene_otra
+    hits = RowFeatures.de(fila).hits
+    return bool(hits & CUPS_ENCABEZADO_SERVICIOS) and bool(hits & OTRAS_ENCABEZADO_SERVICIOS)
 
 
 def es_dato_de_sede(fila: list) -> bool:
-    """Detecta si una fila contiene DATOS de sede."""
+    """Detecta si una fila contiene DATOS de sede.
+    🆕 v15.2: fila puede ser una lista o un RowFeatures (el resultado queda cacheado).
+    """
     if not fila or len(fila) < 3:
         return False
 
-    col0 = str(fila[0]).upper().strip() if fila[0] is not None else ''
-    col1 = str(fila[1]).upper().strip() if len(fila) > 1 and fila[1] is not None else ''
-
-    es_depto = col0 in DEPARTAMENTOS_COLOMBIA or any(d in col0 for d in DEPARTAMENTOS_COLOMBIA)
-    es_muni = col1 in MUNICIPIOS_COLOMBIA or any(m in col1 for m in MUNICIPIOS_COLOMBIA)
-
-    if es_depto and es_muni:
-        return True
-
-    for celda in fila[:8]:
-        if celda:
-            celda_str = str(celda).upper()
-            for patron in PATRONES_DIRECCION:
-                if patron in celda_str:
-                    for otra in fila[:8]:
-                        if otra:
-                            otra_str = str(otra).strip().replace('.0', '').replace('-', '')
-                            if otra_str.isdigit() and 8 <= len(otra_str) <= 12:
-                                return True
-
-    return False
+    return RowFeatures.de(fila).es_dato_sede
 
 
 def es_municipio_o_departamento(valor: str) -> bool:
@@ -2363,11 +2954,7 @@ def es_direccion(valor: str) -> bool:
     """Detecta si un valor es una dirección."""
     if not valor:
         return False
-    valor_u = str(valor).upper()
-    for patron in PATRONES_DIRECCION:
-        if patron in valor_u:
-            return True
-    return False
+    return VOCAB_DIRECCION.contiene(str(valor).upper())
 
 
 PREFIJOS_CELULAR_COLOMBIA = {
@@ -2455,27 +3042,110 @@ PATRONES_INVALIDOS_CUPS = [
     r'NOTA\s*\d*',
 ]
 
+# 🆕 v15.2: Vocabularios compilados de validación de CUPS y traslados
+VOCAB_INVALIDAS_CUPS = VocabularioCompilado(PALABRAS_INVALIDAS_CUPS)
+REGEX_INVALIDOS_CUPS = re.compile('|'.join(f'(?:{p})' for p in PATRONES_INVALIDOS_CUPS))
+VOCAB_CIUDADES = VocabularioCompilado(CIUDADES_COLOMBIA_COMPLETA)
+INDICADORES_TRASLADOS = {
+    'ORIGEN',
+    'DESTINO',
+    'MUNICIPIO ORIGEN',
+    'MUNICIPIO DESTINO',
+    'DEPARTAMENTO DESTINO',
+    'TIPO DE TRASLADO',
+}
+# 🆕 v15.2: Todas las palabras de encabezado (sedes, servicios, traslados) en un vocabulario
+VOCAB_ENCABEZADOS_FILA = VocabularioCompilado(
+    PALABRAS_ENCABEZADO_SEDES | CUPS_ENCABEZADO_SERVICIOS | OTRAS_ENCABEZADO_SERVICIOS
+    | INDICADORES_TRASLADOS | {'CUPS'}
+)
+
+
+class RowFeatures:
+    """🆕 v15.2: Rasgos de una fila, calculados una sola vez y solo si se piden.
+    El bucle de extracción crea uno por fila y lo pasa a todos los predicados
+    (encabezados, dato de sede, traslados, validar_cups), que también aceptan
+    la lista cruda. Se comporta como la lista para len() y bool().
+    """
+
+    def __init__(self, fila: list):
+        self.fila = fila
+
+    @staticmethod
+    def de(fila) -> 'RowFeatures':
+        return fila if isinstance(fila, RowFeatures) else RowFeatures(fila)
+
+    def __len__(self) -> int:
+        return len(self.fila) if self.fila else 0
+
+    def __getitem__(self, idx):
+        return self.fila[idx]
+
+    @cached_property
+    def texto(self) -> str:
+        """Celdas no nulas en mayúsculas, unidas por espacio."""
+        return texto_fila(self.fila)
+
+    @cached_property
+    def hits(self) -> Set[str]:
+        """Palabras de VOCAB_ENCABEZADOS_FILA presentes en el texto de la fila."""
+        return VOCAB_ENCABEZADOS_FILA.encontrar(self.texto)
+
+    @cached_property
+    def col0(self) -> str:
+        return str(self.fila[0]).upper().strip() if self.fila[0] is not None else ''
+
+    @cached_property
+    def col1(self) -> str:
+        return str(self.fila[1]).upper().strip() if len(self.fila) > 1 and self.fila[1] is not None else ''
+
+    @cached_property
+    def mayusculas8(self) -> List[str]:
+        """Primeras 8 celdas no vacías en mayúsculas (sin strip, como las busca PATRONES_DIRECCION)."""
+        return [str(c).upper() for c in self.fila[:8] if c]
+
+    @cached_property
+    def digitos8(self) -> List[str]:
+        """Primeras 8 celdas no vacías sin '.0' ni guiones."""
+        return [str(c).strip().replace('.0', '').replace('-', '') for c in self.fila[:8] if c]
+
+    @cached_property
+    def es_dato_sede(self) -> bool:
+        # 🆕 v15.2: Gazetteer (contiene ⊇ igualdad exacta) en vez de recorrer cada conjunto
+        if VOCAB_DEPARTAMENTOS.contiene(self.col0) and VOCAB_MUNICIPIOS.contiene(self.col1):
+            return True
+
+        # Alguna celda con dirección y alguna celda con 8-12 dígitos (código de habilitación/teléfono)
+        return (
+            any(VOCAB_DIRECCION.contiene(c) for c in self.mayusculas8)
+            and any(d.isdigit() and 8 <= len(d) <= 12 for d in self.digitos8)
+        )
+
+    @cached_property
+    def es_traslados(self) -> bool:
+        # Verificar si hay ciudades en las primeras columnas
+        for celda in self.fila[:4]:
+            if celda:
+                celda_str = str(celda).strip()
+                if celda_str.endswith('.0'):
+                    celda_str = celda_str[:-2]
+
+                # Verificar contra lista de ciudades
+                if VOCAB_CIUDADES.es_exacta(celda_str.upper()):
+                    return True
+
+        return False
+
 
 def es_fila_de_traslados(fila: list) -> bool:
     """🆕 v14.1: Detecta si una fila de DATOS contiene información de traslados.
     Una fila es de traslados si tiene ciudades en las primeras columnas.
+    🆕 v15.2: fila puede ser una lista o un RowFeatures (el resultado queda cacheado).
     """
     if not fila or len(fila) < 3:
         return False
 
-    # Verificar si hay ciudades en las primeras columnas
-    for i, celda in enumerate(fila[:4]):
-        if celda:
-            celda_str = str(celda).strip()
-            if celda_str.endswith('.0'):
-                celda_str = celda_str[:-2]
-            celda_upper = celda_str.upper()
-
-            # Verificar contra lista de ciudades
-            if celda_upper in CIUDADES_COLOMBIA_COMPLETA:
-                return True
-
-    return False
+    return RowFeatures.de(fila).es_traslados
 
 
 def es_encabezado_seccion_traslados(fila: list) -> bool:
@@ -2483,25 +3153,12 @@ def es_encabezado_seccion_traslados(fila: list) -> bool:
     if not fila:
         return False
 
-    fila_texto = ' '.join([str(x).upper().strip() for x in fila if x is not None])
-
-    # Patrones específicos de encabezados de traslados
-    indicadores_traslados = [
-        'ORIGEN',
-        'DESTINO',
-        'MUNICIPIO ORIGEN',
-        'MUNICIPIO DESTINO',
-        'DEPARTAMENTO DESTINO',
-        'TIPO DE TRASLADO',
-    ]
-
-    contador = 0
-    for indicador in indicadores_traslados:
-        if indicador in fila_texto:
-            contador += 1
+    # 🆕 v15.2: Indicadores de traslados (INDICADORES_TRASLADOS) y CUPS en una pasada
+    hits = RowFeatures.de(fila).hits
+    contador = len(hits & INDICADORES_TRASLADOS)
 
     # Si tiene 2+ indicadores de traslados Y NO tiene CUPS, es sección de traslados
-    tiene_cups = 'CUPS' in fila_texto
+    tiene_cups = 'CUPS' in hits
     return contador >= 2 and not tiene_cups
 
 
@@ -2531,18 +3188,16 @@ def validar_cups(cups: str, fila: list = None) -> bool:
         return False
 
     # 2. 🆕 v14.1: RECHAZAR si es una ciudad (traslados)
-    if cups_u in CIUDADES_COLOMBIA_COMPLETA:
+    if VOCAB_CIUDADES.es_exacta(cups_u):
         return False
 
-    # 3. RECHAZAR palabras inválidas
-    for palabra in PALABRAS_INVALIDAS_CUPS:
-        if palabra in cups_u:
-            return False
+    # 3. RECHAZAR palabras inválidas (🆕 v15.2: vocabulario compilado)
+    if VOCAB_INVALIDAS_CUPS.contiene(cups_u):
+        return False
 
-    # 4. RECHAZAR patrones inválidos
-    for patron in PATRONES_INVALIDOS_CUPS:
-        if re.search(patron, cups_u):
-            return False
+    # 4. RECHAZAR patrones inválidos (🆕 v15.2: una sola regex)
+    if REGEX_INVALIDOS_CUPS.search(cups_u):
+        return False
 
     # 5. Extraer solo dígitos
     cups_digits = re.sub(r'[^\d]', '', cups_str)
@@ -2591,6 +3246,12 @@ def validar_cups(cups: str, fila: list = None) -> bool:
     return True
 
 
+def es_candidata_cups(valor) -> bool:
+    """🆕 v15.2: Chequeo barato de "podría ser un CUPS" (para detectar fin de tabla)."""
+    codigo = limpiar_codigo(valor)
+    return bool(codigo) and any(ch.isdigit() for ch in codigo)
+
+
 def validar_tarifa(tarifa, fila: list = None) -> bool:
     """🆕 v14.1: Validación mejorada de tarifas.
     Solo rechaza si CLARAMENTE es un teléfono celular.
@@ -2613,9 +3274,8 @@ def validar_tarifa(tarifa, fila: list = None) -> bool:
     if valor_clean and 8 <= len(valor_clean) <= 12:
         if fila:
             fila_texto = ' '.join([str(x).upper() for x in fila[:5] if x])
-            for depto in DEPARTAMENTOS_COLOMBIA:
-                if depto in fila_texto:
-                    return False
+            if VOCAB_DEPARTAMENTOS.contiene(fila_texto):
+                return False
 
     return True
 
@@ -2637,11 +3297,159 @@ def validar_descripcion(descripcion) -> bool:
     return not es_municipio_o_departamento(desc_str)
 
 
+# ══════════════════════════════════════════════════════════════════════════════
+# 🆕 v15.2: VALIDACIÓN POR LOTES (pandas)
+# ══════════════════════════════════════════════════════════════════════════════
+
+class MotivoRechazo(Enum):
+    """🆕 v15.2: Primera regla que rechaza una fila candidata (mismo orden que los validadores)."""
+    CUPS_VACIO = "CUPS_VACIO"
+    CUPS_LONGITUD = "CUPS_LONGITUD"
+    CUPS_CIUDAD = "CUPS_CIUDAD"
+    CUPS_PALABRA_INVALIDA = "CUPS_PALABRA_INVALIDA"
+    CUPS_PATRON_INVALIDO = "CUPS_PATRON_INVALIDO"
+    CUPS_VALOR_MONETARIO = "CUPS_VALOR_MONETARIO"
+    CUPS_TELEFONO = "CUPS_TELEFONO"
+    CUPS_HABILITACION = "CUPS_HABILITACION"
+    CUPS_MUNICIPIO_DEPARTAMENTO = "CUPS_MUNICIPIO_DEPARTAMENTO"
+    CUPS_DIRECCION = "CUPS_DIRECCION"
+    CUPS_VALOR_ESPECIAL = "CUPS_VALOR_ESPECIAL"
+    CUPS_NUMERO_SEDE = "CUPS_NUMERO_SEDE"
+    CUPS_POCOS_DIGITOS = "CUPS_POCOS_DIGITOS"
+    FILA_TRASLADOS = "FILA_TRASLADOS"
+    FILA_DATO_SEDE = "FILA_DATO_SEDE"
+    TARIFA_TELEFONO = "TARIFA_TELEFONO"
+    MANUAL_DIRECCION = "MANUAL_DIRECCION"
+    MANUAL_TELEFONO = "MANUAL_TELEFONO"
+    DESCRIPCION_NUMERO_SEDE = "DESCRIPCION_NUMERO_SEDE"
+    DESCRIPCION_MUNICIPIO_DEPARTAMENTO = "DESCRIPCION_MUNICIPIO_DEPARTAMENTO"
+
+
+VALORES_ESPECIALES_CUPS = ['N.A', 'NA', 'N/A', 'N.A.', '-', '--', '---', 'NINGUNO', 'NINGUNA', 'NULL', 'NONE', '']
+
+
+@dataclass
+class ValidacionLote:
+    """🆕 v15.2: Resultado de validar_servicios_lote."""
+    validos: np.ndarray
+    motivos: List[Optional[MotivoRechazo]]
+    conteos: Dict[str, int] = field(default_factory=dict)
+
+
+def _como_texto(serie: pd.Series) -> pd.Series:
+    """str(valor) de cada celda no nula ('' para nulas)."""
+    return serie.map(lambda v: '' if v is None else str(v))
+
+
+def _sin_punto_cero(serie: pd.Series) -> pd.Series:
+    return serie.where(~serie.str.endswith('.0'), serie.str[:-2])
+
+
+def _es_telefono_celular_vec(serie: pd.Series) -> pd.Series:
+    """es_telefono_celular_colombiano sobre una columna de textos."""
+    digitos = _sin_punto_cero(serie.str.strip()).str.replace(r'[^\d]', '', regex=True)
+    return (digitos.str.len() == 10) & digitos.str[:3].isin(PREFIJOS_CELULAR_COLOMBIA)
+
+
+def _es_direccion_vec(serie: pd.Series) -> pd.Series:
+    return serie.str.upper().str.contains(VOCAB_DIRECCION.patron, regex=True)
+
+
+def _es_municipio_o_departamento_vec(serie: pd.Series) -> pd.Series:
+    return serie.str.upper().str.strip().isin(MUNICIPIOS_COLOMBIA | DEPARTAMENTOS_COLOMBIA)
+
+
+def _es_numero_sede_vec(serie: pd.Series) -> pd.Series:
+    valor = serie.str.strip().str.replace('.0', '', regex=False)
+    return valor.str.isdigit() & (valor.str.len() <= 2)
+
+
+def validar_servicios_lote(cups, tarifas, manuales, descripciones, filas=None) -> ValidacionLote:
+    """🆕 v15.2: validar_cups + validar_tarifa + validar_manual_tarifario +
+    validar_descripcion sobre columnas completas de filas candidatas.
+    Las reglas por valor usan operaciones vectorizadas de pandas; las de fila
+    (traslados, dato de sede) solo se evalúan en las filas que pasaron las
+    reglas de CUPS. Cada fila rechazada lleva la primera regla que falla.
+    """
+    n = len(cups)
+    col_cups = pd.Series(list(cups), dtype=object)
+    col_tarifa = pd.Series(list(tarifas), dtype=object)
+    col_manual = pd.Series(list(manuales), dtype=object)
+    col_desc = pd.Series(list(descripciones), dtype=object)
+
+    cups_str = _sin_punto_cero(_como_texto(col_cups).str.strip())
+    cups_u = cups_str.str.upper()
+    digitos = cups_str.str.replace(r'[^\d]', '', regex=True)
+    n_digitos = digitos.str.len()
+    solo_digitos = (n_digitos > 0) & (digitos == cups_str)
+
+    reglas_cups = [
+        (MotivoRechazo.CUPS_VACIO, col_cups.isna() | col_cups.eq('')),
+        (MotivoRechazo.CUPS_LONGITUD, cups_str.eq('') | (cups_str.str.len() > 25)),
+        (MotivoRechazo.CUPS_CIUDAD, cups_u.isin(CIUDADES_COLOMBIA_COMPLETA)),
+        (MotivoRechazo.CUPS_PALABRA_INVALIDA, cups_u.str.contains(VOCAB_INVALIDAS_CUPS.patron, regex=True)),
+        (MotivoRechazo.CUPS_PATRON_INVALIDO, cups_u.str.contains(REGEX_INVALIDOS_CUPS.pattern, regex=True)),
+        (MotivoRechazo.CUPS_VALOR_MONETARIO, n_digitos >= 7),
+        (MotivoRechazo.CUPS_TELEFONO, _es_telefono_celular_vec(cups_str)),
+        (MotivoRechazo.CUPS_HABILITACION, solo_digitos & n_digitos.between(8, 12)),
+        (MotivoRechazo.CUPS_MUNICIPIO_DEPARTAMENTO, _es_municipio_o_departamento_vec(cups_u)),
+        (MotivoRechazo.CUPS_DIRECCION, _es_direccion_vec(cups_u)),
+        (MotivoRechazo.CUPS_VALOR_ESPECIAL, cups_u.isin(VALORES_ESPECIALES_CUPS)),
+        (MotivoRechazo.CUPS_NUMERO_SEDE, _es_numero_sede_vec(cups_str)),
+        (MotivoRechazo.CUPS_POCOS_DIGITOS, solo_digitos & (n_digitos < 4)),
+    ]
+
+    tarifa_str = _sin_punto_cero(_como_texto(col_tarifa).str.strip())
+    manual_str = _como_texto(col_manual)
+    desc_str = _como_texto(col_desc).str.strip()
+
+    reglas_valores = [
+        (MotivoRechazo.TARIFA_TELEFONO, col_tarifa.notna() & _es_telefono_celular_vec(tarifa_str)),
+        (MotivoRechazo.MANUAL_DIRECCION, col_manual.notna() & _es_direccion_vec(manual_str)),
+        (MotivoRechazo.MANUAL_TELEFONO, col_manual.notna() & _es_telefono_celular_vec(manual_str)),
+        (MotivoRechazo.DESCRIPCION_NUMERO_SEDE, col_desc.notna() & _es_numero_sede_vec(desc_str)),
+        (MotivoRechazo.DESCRIPCION_MUNICIPIO_DEPARTAMENTO,
+         col_desc.notna() & _es_municipio_o_departamento_vec(desc_str)),
+    ]
+
+    motivos = np.full(n, None, dtype=object)
+    libres = np.ones(n, dtype=bool)
+
+    def _aplicar(motivo: MotivoRechazo, rechaza: np.ndarray):
+        nonlocal libres
+        marcadas = libres & rechaza
+        motivos[marcadas] = motivo
+        libres = libres & ~marcadas
+
+    for motivo, rechaza in reglas_cups:
+        _aplicar(motivo, rechaza.to_numpy(dtype=bool))
+
+    if filas is not None:
+        traslados = np.zeros(n, dtype=bool)
+        dato_sede = np.zeros(n, dtype=bool)
+        for pos in np.flatnonzero(libres):
+            fila = filas[pos]
+            if fila and es_fila_de_traslados(fila):
+                traslados[pos] = True
+            elif fila and es_dato_de_sede(fila):
+                dato_sede[pos] = True
+        _aplicar(MotivoRechazo.FILA_TRASLADOS, traslados)
+        _aplicar(MotivoRechazo.FILA_DATO_SEDE, dato_sede)
+
+    for motivo, rechaza in reglas_valores:
+        _aplicar(motivo, rechaza.to_numpy(dtype=bool))
+
+    conteos = pd.Series([m.value for m in motivos if m is not None], dtype=object).value_counts()
+    return ValidacionLote(libres, list(motivos), {k: int(v) for k, v in conteos.items()})
+
+
 print("✅ Validación semántica v14.1 cargada")
 print("✅ 🆕 Lista expandida de ciudades colombianas")
 print("✅ 🆕 Validación CUPS ultra estricta (rechaza ciudades/valores monetarios)")
 print("✅ 🆕 Teléfonos: detecta números SIN guiones")
 print("✅ 🆕 Alerta PAQUETES: solo si no hay hoja de servicios")
+print("✅ 🆕 Vocabularios compilados y rasgos de fila calculados una vez (RowFeatures)")
+print("✅ 🆕 Validación de servicios por lotes con motivo de rechazo (validar_servicios_lote)")
 LOG.dedent()
 
 # ══════════════════════════════════════════════════════════════════════════════
@@ -2694,6 +3502,40 @@ class ColumnasIdentificadas:
 
 COLS = ColumnasIdentificadas()
 
+
+class MaestraIndex:
+    """🆕 v15.2: Índice de filas de la maestra, construido una vez al cargarla.
+    - por_cto: valor de CTO → posición de la fila
+    - por_numero: (número zfill(4), año) normalizados → posición de la fila
+    Ante duplicados gana la primera aparición (igual que mask.iloc[0]).
+    """
+
+    def __init__(self, df: pd.DataFrame, cols: ColumnasIdentificadas):
+        self.df = df
+        self.por_cto: Dict[Any, int] = {}
+        self.por_numero: Dict[Tuple[str, str], int] = {}
+
+        if cols.cto:
+            for pos, valor in enumerate(df[cols.cto].tolist()):
+                try:
+                    self.por_cto.setdefault(valor, pos)
+                except TypeError:
+                    pass
+
+        if cols.numero_contrato and cols.ano_contrato:
+            numeros = df[cols.numero_contrato].astype(str).str.replace('.0', '', regex=False).str.zfill(4)
+            anos = df[cols.ano_contrato].astype(str).str.replace('.0', '', regex=False)
+            for pos, clave in enumerate(zip(numeros.tolist(), anos.tolist())):
+                self.por_numero.setdefault(clave, pos)
+
+    def fila(self, numero: str, ano: str) -> Optional[pd.Series]:
+        """Fila del contrato: primero por CTO 'NNNN-AAAA', luego por (número, año)."""
+        pos = self.por_cto.get(f"{str(numero).zfill(4)}-{ano}")
+        if pos is None:
+            pos = self.por_numero.get((str(numero).zfill(4), str(ano)))
+        return self.df.iloc[pos] if pos is not None else None
+
+
 for col in df_maestra.columns:
     col_upper = str(col).upper().strip()
     if 'TIPO' in col_upper and 'PROVEEDOR' in col_upper:
@@ -2755,6 +3597,11 @@ if COLS.ano_contrato:
     LOG.info("Años disponibles", str(anos))
 
 print("─" * 50)
+
+# 🆕 v15.2: Índices de búsqueda por contrato (sin máscaras por cada consulta)
+INDICE_PRESTADORES = MaestraIndex(df_prestadores, COLS)
+INDICE_MAESTRA = MaestraIndex(df_maestra, COLS)
+LOG.success("🆕 Índice de maestra", f"{len(INDICE_MAESTRA.por_cto):,} CTO, {len(INDICE_MAESTRA.por_numero):,} número/año")
 LOG.dedent()
 
 # ══════════════════════════════════════════════════════════════════════════════
@@ -2764,10 +3611,276 @@ LOG.dedent()
 LOG.step(4, 6, "CONFIGURANDO CLIENTE SFTP v14.1")
 LOG.indent()
 
+class CacheListados:
+    """🆕 v15.2: Cache TTL/LRU de listados remotos indexado por ruta absoluta.
+    Una misma instancia puede compartirse entre varias sesiones SFTP.
+    """
+
+    def __init__(self, ttl: float, max_entradas: int):
+        self.ttl = ttl
+        self.max_entradas = max_entradas
+        self._datos: "OrderedDict[str, Tuple[float, List[Dict]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.aciertos = 0
+        self.fallos = 0
+
+    @property
+    def habilitado(self) -> bool:
+        return self.ttl > 0 and self.max_entradas > 0
+
+    def obtener(self, ruta: str) -> Optional[List[Dict]]:
+        if not self.habilitado:
+            return None
+        with self._lock:
+            entrada = self._datos.get(ruta)
+            if entrada is None:
+                self.fallos += 1
+                return None
+            guardado, items = entrada
+            if time.time() - guardado > self.ttl:
+                del self._datos[ruta]
+                self.fallos += 1
+                return None
+            self._datos.move_to_end(ruta)
+            self.aciertos += 1
+            return items
+
+    def guardar(self, ruta: str, items: List[Dict]):
+        if not self.habilitado:
+            return
+        with self._lock:
+            self._datos[ruta] = (time.time(), items)
+            self._datos.move_to_end(ruta)
+            while len(self._datos) > self.max_entradas:
+                self._datos.popitem(last=False)
+
+    def invalidar(self, ruta: str = None, recursivo: bool = False):
+        """Invalida una ruta (y opcionalmente todo lo que cuelga de ella) o toda la cache."""
+        with self._lock:
+            if ruta is None:
+                self._datos.clear()
+                return
+            self._datos.pop(ruta, None)
+            if recursivo:
+                prefijo = ruta.rstrip('/') + '/'
+                for clave in [k for k in self._datos if k.startswith(prefijo)]:
+                    del self._datos[clave]
+
+    def resumen(self) -> str:
+        total = self.aciertos + self.fallos
+        return f"{self.aciertos}/{total} aciertos, {len(self._datos)} rutas en cache"
+
+
+class CacheDescargas:
+    """🆕 v15.2: Cache persistente de archivos descargados.
+    La clave es el hash de (ruta remota, tamaño, fecha de modificación): si el archivo
+    cambia en GoAnywhere cambia la clave y se vuelve a descargar. Se desaloja por LRU
+    cuando el total supera max_mb.
+    """
+
+    ARCHIVO_INDICE = 'indice.json'
+
+    def __init__(self, carpeta: str, max_mb: int):
+        self.carpeta = carpeta
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self._lock = threading.Lock()
+        self._indice: Dict[str, Dict] = {}
+        self.aciertos = 0
+        self.fallos = 0
+        self.bytes_ahorrados = 0
+        if self.habilitado:
+            os.makedirs(self.carpeta, exist_ok=True)
+            self._cargar_indice()
+
+    @property
+    def habilitado(self) -> bool:
+        return self.max_bytes > 0
+
+    @staticmethod
+    def clave(ruta_remota: str, tamano: int, mtime: float) -> str:
+        return hashlib.sha1(f"{ruta_remota}|{int(tamano)}|{int(mtime)}".encode('utf-8')).hexdigest()
+
+    def _ruta_indice(self) -> str:
+        return os.path.join(self.carpeta, self.ARCHIVO_INDICE)
+
+    def _cargar_indice(self):
+        try:
+            with open(self._ruta_indice(), 'r', encoding='utf-8') as f:
+                indice = json.load(f)
+        except Exception:
+            indice = {}
+        # Descartar entradas cuyo archivo ya no existe
+        self._indice = {
+            k: v for k, v in indice.items()
+            if os.path.exists(os.path.join(self.carpeta, v.get('archivo', '')))
+        }
+
+    def _guardar_indice(self):
+        tmp = self._ruta_indice() + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self._indice, f)
+        os.replace(tmp, self._ruta_indice())
+
+    def obtener(self, ruta_remota: str, tamano: int, mtime: float, destino: str) -> bool:
+        """Copia el archivo cacheado a destino. Retorna False si no está (o no coincide)."""
+        if not self.habilitado or tamano is None or mtime is None:
+            return False
+        clave = self.clave(ruta_remota, tamano, mtime)
+        with self._lock:
+            entrada = self._indice.get(clave)
+            ruta_cache = os.path.join(self.carpeta, entrada['archivo']) if entrada else None
+            if not ruta_cache or not os.path.exists(ruta_cache) or os.path.getsize(ruta_cache) != tamano:
+                if entrada:
+                    self._indice.pop(clave, None)
+                self.fallos += 1
+                return False
+            shutil.copyfile(ruta_cache, destino)
+            entrada['ultimo_uso'] = time.time()
+            self.aciertos += 1
+            self.bytes_ahorrados += tamano
+            self._guardar_indice()
+            return True
+
+    def guardar(self, ruta_remota: str, tamano: int, mtime: float, origen: str):
+        """Guarda una copia del archivo recién descargado y aplica el límite de tamaño."""
+        if not self.habilitado or tamano is None or mtime is None:
+            return
+        if not os.path.exists(origen) or os.path.getsize(origen) != tamano:
+            return
+        clave = self.clave(ruta_remota, tamano, mtime)
+        archivo = clave + os.path.splitext(ruta_remota)[1].lower()
+        with self._lock:
+            shutil.copyfile(origen, os.path.join(self.carpeta, archivo))
+            self._indice[clave] = {
+                'ruta_remota': ruta_remota,
+                'tamano': tamano,
+                'mtime': mtime,
+                'archivo': archivo,
+                'ultimo_uso': time.time()
+            }
+            self._desalojar()
+            self._guardar_indice()
+
+    def _desalojar(self):
+        total = sum(v['tamano'] for v in self._indice.values())
+        for clave, entrada in sorted(self._indice.items(), key=lambda kv: kv[1]['ultimo_uso']):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.carpeta, entrada['archivo']))
+            except OSError:
+                pass
+            total -= entrada['tamano']
+            del self._indice[clave]
+
+    def resumen(self) -> str:
+        total = self.aciertos + self.fallos
+        return f"{self.aciertos}/{total} aciertos, {self.bytes_ahorrados/1024/1024:.1f} MB no transferidos"
+
+
+class IndiceRemoto:
+    """🆕 v15.2: Índice (SQLite) de carpetas de GoAnywhere ya listadas.
+    Guarda por carpeta sus entradas (nombre, tamaño, mtime, es_dir) y cuándo se
+    listó; listar() responde desde aquí mientras la carpeta no supere max_horas.
+    Solo valen los listados hechos desde que se abrió el índice: los de
+    ejecuciones anteriores se dan por vencidos (puede haber actas o tarifas
+    nuevas) y el barrido inicial los renueva.
+    """
+
+    def __init__(self, ruta: str, max_horas: float):
+        self.ruta = ruta
+        self.max_segundos = max_horas * 3600
+        self.desde = time.time()
+        self._lock = threading.Lock()
+        self.aciertos = 0
+        self._db = sqlite3.connect(ruta, check_same_thread=False)
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS carpetas (ruta TEXT PRIMARY KEY, indexada REAL NOT NULL);
+            CREATE TABLE IF NOT EXISTS entradas (
+                padre TEXT NOT NULL, nombre TEXT NOT NULL, tamano INTEGER,
+                es_dir INTEGER NOT NULL, mtime REAL, PRIMARY KEY (padre, nombre)
+            );
+        """)
+
+    def vigente(self, ruta_abs: str) -> bool:
+        with self._lock:
+            fila = self._db.execute("SELECT indexada FROM carpetas WHERE ruta = ?", (ruta_abs,)).fetchone()
+        return bool(fila) and fila[0] >= self.desde and time.time() - fila[0] <= self.max_segundos
+
+    def listado(self, ruta_abs: str) -> Optional[List[Dict]]:
+        """Entradas de la carpeta en el formato de SFTPClient.listar (None si no está o venció)."""
+        if not self.vigente(ruta_abs):
+            return None
+        with self._lock:
+            filas = self._db.execute(
+                "SELECT nombre, tamano, es_dir, mtime FROM entradas WHERE padre = ? ORDER BY rowid", (ruta_abs,)
+            ).fetchall()
+            self.aciertos += 1
+        return [
+            {'nombre': n, 'tamano': t, 'es_directorio': bool(d), 'fecha_modificacion': m}
+            for n, t, d, m in filas
+        ]
+
+    def guardar(self, ruta_abs: str, items: List[Dict], confirmar: bool = True):
+        with self._lock:
+            self._db.execute("DELETE FROM entradas WHERE padre = ?", (ruta_abs,))
+            self._db.executemany(
+                "INSERT OR REPLACE INTO entradas VALUES (?, ?, ?, ?, ?)",
+                [(ruta_abs, i['nombre'], i['tamano'], int(i['es_directorio']), i['fecha_modificacion']) for i in items]
+            )
+            self._db.execute("INSERT OR REPLACE INTO carpetas VALUES (?, ?)", (ruta_abs, time.time()))
+            if confirmar:
+                self._db.commit()
+
+    def barrer(self, clientes: List['SFTPClient'], raices: List[str], expandir: Callable[[str, int], bool]) -> int:
+        """Lista en paralelo (un hilo por cliente) el árbol bajo raices, nivel por nivel.
+        expandir(nombre, profundidad) decide en qué subcarpetas se baja. Retorna carpetas indexadas.
+        """
+        libres = queue.Queue()
+        for cli in clientes:
+            libres.put(cli)
+
+        def _listar(ruta: str):
+            cli = libres.get()
+            try:
+                return cli.listar(ruta, usar_cache=False, usar_indice=False)
+            except Exception:
+                return None
+            finally:
+                libres.put(cli)
+
+        total = 0
+        nivel = [(r, 0) for r in raices]
+        with ThreadPoolExecutor(max_workers=max(1, len(clientes))) as ejecutor:
+            while nivel:
+                siguientes = []
+                for (ruta, prof), items in zip(nivel, ejecutor.map(lambda x: _listar(x[0]), nivel)):
+                    if items is None:
+                        continue
+                    self.guardar(ruta, items, confirmar=False)
+                    total += 1
+                    for item in items:
+                        if item['es_directorio'] and expandir(item['nombre'], prof + 1):
+                            siguientes.append((posixpath.join(ruta, item['nombre']), prof + 1))
+                nivel = siguientes
+        with self._lock:
+            self._db.commit()
+        return total
+
+    def cerrar(self):
+        with self._lock:
+            self._db.close()
+
+
 class SFTPClient:
     """🆕 v14.1: Cliente SFTP con reconexión forzada por contrato."""
 
-    def __init__(self, config: Config, logger: Logger):
+    # 🆕 v15.2: reconectar_forzado abre una conexión nueva (GestorConexiones puede
+    # reciclar por edad, volumen o errores)
+    RECICLABLE = True
+
+    def __init__(self, config: Config, logger: Logger, cache_listados: CacheListados = None,
+                 cache_descargas: CacheDescargas = None, indice_remoto: IndiceRemoto = None):
         self.config = config
         self.log = logger
         self._client = None
@@ -2775,6 +3888,27 @@ class SFTPClient:
         self._transport = None
         self._reconexiones = 0
         self._current_path = "/"
+        # 🆕 v15.2: Evita que varios hilos reconecten la misma sesión a la vez
+        self._lock_conexion = threading.RLock()
+        # 🆕 v15.2: Cache de listados (puede venir compartida desde el pool de sesiones)
+        self.cache_listados = cache_listados or CacheListados(config.CACHE_LISTADOS_TTL, config.CACHE_LISTADOS_MAX)
+        # 🆕 v15.2: Cache persistente de descargas (opcional, compartida)
+        self.cache_descargas = cache_descargas
+        # 🆕 v15.2: Índice SQLite del árbol remoto (opcional, compartido)
+        self.indice_remoto = indice_remoto
+        # 🆕 v15.2: Liveness por estado del transporte + última operación exitosa
+        self._ultimo_exito = 0.0
+        self.operaciones = 0
+        self.sondeos = 0
+        self.sondeos_evitados = 0
+        # 🆕 v15.2: Métricas para GestorConexiones
+        self.handshakes = 0
+        self.tiempo_conexion = 0.0
+        self.conectado_desde = 0.0
+        self.bytes_conexion = 0
+        self.resultados_ops = deque(maxlen=config.RECICLAR_VENTANA_OPS)
+        # 🆕 v15.2: Descargas parciales (.part) que se pueden continuar: ruta local → (tamaño, mtime) remotos
+        self._partes: Dict[str, Tuple[int, float]] = {}
 
     def _cerrar(self):
         for c in [self._sftp, self._client]:
@@ -2795,6 +3929,8 @@ class SFTPClient:
                 if not silencioso:
                     self.log.info(f"Conectando a {self.config.HOST}:{self.config.PORT}...")
 
+                t_inicio = time.time()
+                self.handshakes += 1
                 self._client = paramiko.SSHClient()
                 self._client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
                 self._client.connect(
@@ -2814,12 +3950,17 @@ class SFTPClient:
                 self._sftp = self._client.open_sftp()
                 self._sftp.get_channel().settimeout(self.config.TIMEOUT_OPERACION)
                 self._current_path = "/"
+                self._ultimo_exito = self.conectado_desde = time.time()
+                self.tiempo_conexion += self._ultimo_exito - t_inicio
+                self.bytes_conexion = 0
+                self.resultados_ops.clear()
 
                 if not silencioso:
                     self.log.success("Conexión establecida")
                 return True
 
             except Exception as e:
+                self.tiempo_conexion += time.time() - t_inicio
                 self._cerrar()
                 if intento < self.config.MAX_REINTENTOS_CONEXION - 1:
                     espera = self.config.BACKOFF_BASE ** intento
@@ -2829,78 +3970,489 @@ class SFTPClient:
 
         if not silencioso:
             self.log.error("No se pudo conectar después de varios intentos")
-        return False
+        return False
+
+    def reconectar_forzado(self, silencioso: bool = True, espera: float = 0.5) -> bool:
+        """🆕 v14.1: Fuerza reconexión. 🆕 v15.2: espera=0 para reciclar una conexión sana."""
+        self._reconexiones += 1
+        self._cerrar()
+        if espera:
+            time.sleep(espera)
+        return self.conectar(silencioso)
+
+    def esta_activo(self) -> bool:
+        """🆕 v15.2: Sin round-trip si el transporte está activo y hubo éxito reciente.
+        Solo tras un fallo o un periodo sin actividad se sondea el servidor (stat '/').
+        """
+        try:
+            if not self._sftp or not self._transport: return False
+            if not self._transport.is_active(): return False
+            if time.time() - self._ultimo_exito <= self.config.VENTANA_ACTIVIDAD_SFTP:
+                self.sondeos_evitados += 1
+                return True
+            self.sondeos += 1
+            self._sftp.stat('/')
+            self._ultimo_exito = time.time()
+            return True
+        except:
+            return False
+
+    def _ejecutar(self, operacion: Callable, descripcion: str = "operación"):
+        for intento in range(self.config.MAX_REINTENTOS_OPERACION):
+            try:
+                if not self.esta_activo():
+                    with self._lock_conexion:
+                        if not self.esta_activo():
+                            self._reconexiones += 1
+                            self.log.warning("Reconectando...", f"intento {self._reconexiones}")
+                            if not self.conectar(True):
+                                raise Exception("Reconexión fallida")
+                resultado = operacion()
+                self._ultimo_exito = time.time()
+                self.operaciones += 1
+                self.resultados_ops.append(True)
+                return resultado
+            except Exception as e:
+                # Fallo real: el próximo intento sondea la conexión antes de operar
+                self._ultimo_exito = 0.0
+                self.resultados_ops.append(False)
+                if intento == self.config.MAX_REINTENTOS_OPERACION - 1:
+                    raise
+                time.sleep(1)
+
+    def ruta_absoluta(self, ruta: str = '.') -> str:
+        """🆕 v15.2: Resuelve una ruta remota contra el directorio actual."""
+        ruta_abs = posixpath.normpath(posixpath.join(self._current_path or '/', ruta))
+        return '/' + ruta_abs.lstrip('/')
+
+    def listar(self, ruta: str = '.', usar_cache: bool = True, usar_indice: bool = True) -> List[Dict]:
+        """Lista una carpeta remota.
+        🆕 v15.2: Los listados se guardan en cache por ruta absoluta; la lista
+        retornada puede ser compartida, no debe modificarse. Antes de ir al
+        servidor se consulta el índice remoto, si lo hay, y el listado del
+        servidor se guarda en él. usar_indice=False no lo lee ni lo actualiza
+        (IndiceRemoto.barrer guarda por lotes).
+        """
+        ruta_abs = self.ruta_absoluta(ruta)
+
+        if usar_cache:
+            items = self.cache_listados.obtener(ruta_abs)
+            if items is not None:
+                return items
+
+        if usar_indice and self.indice_remoto:
+            items = self.indice_remoto.listado(ruta_abs)
+            if items is not None:
+                self.cache_listados.guardar(ruta_abs, items)
+                return items
+
+        items = self._ejecutar(lambda: self._listar_remoto(ruta_abs))
+        self.cache_listados.guardar(ruta_abs, items)
+        if usar_indice and self.indice_remoto:
+            self.indice_remoto.guardar(ruta_abs, items)
+        return items
+
+    def _listar_remoto(self, ruta_abs: str) -> List[Dict]:
+        return [
+            {
+                'nombre': a.filename,
+                'tamano': a.st_size,
+                'es_directorio': stat.S_ISDIR(a.st_mode),
+                'fecha_modificacion': a.st_mtime
+            }
+            for a in self._sftp.listdir_attr(ruta_abs)
+        ]
+
+    def invalidar_cache(self, ruta: str = None, recursivo: bool = False):
+        """🆕 v15.2: Invalida listados en cache (None = toda la cache)."""
+        self.cache_listados.invalidar(self.ruta_absoluta(ruta) if ruta is not None else None, recursivo)
+
+    def cd(self, ruta: str, log_nav: bool = True):
+        def _op():
+            self._sftp.chdir(ruta)
+            self._current_path = self._sftp.getcwd() or ruta
+        self._ejecutar(_op)
+        if log_nav:
+            self.log.nav(self._current_path)
+
+    def descargar(self, remoto: str, local: str, log_download: bool = True,
+                  tamano: int = None, fecha_modificacion: float = None):
+        """Descarga un archivo remoto. 🆕 v15.2: acepta rutas absolutas (sin depender de cd).
+        Si se conocen tamaño y fecha (de listar), se intenta primero la cache de descargas.
+        """
+        remoto_abs = self.ruta_absoluta(remoto)
+
+        if self.cache_descargas and self.cache_descargas.obtener(remoto_abs, tamano, fecha_modificacion, local):
+            self.log.debug(f"Desde cache local: {posixpath.basename(remoto_abs)}")
+            return
+
+        if log_download:
+            self.log.download(remoto)
+        self._ejecutar(lambda: self._descargar_remoto(remoto_abs, local))
+        try:
+            self.bytes_conexion += os.path.getsize(local)
+        except OSError:
+            pass
+
+        if self.cache_descargas:
+            self.cache_descargas.guardar(remoto_abs, tamano, fecha_modificacion, local)
+
+    def _offset_parte(self, parte: str, tamano: int, mtime: float) -> int:
+        """🆕 v15.2: Bytes ya descargados en el .part, si es del mismo archivo remoto; si no, 0."""
+        if self._partes.get(parte) != (tamano, mtime) or not os.path.exists(parte):
+            self._partes[parte] = (tamano, mtime)
+            return 0
+        offset = os.path.getsize(parte)
+        return offset if offset <= tamano else 0
+
+    def _finalizar_parte(self, parte: str, local: str, tamano: int):
+        """🆕 v15.2: Verifica el tamaño contra st_size y mueve el .part a su lugar."""
+        recibido = os.path.getsize(parte)
+        if recibido != tamano:
+            raise IOError(f"Descarga incompleta ({recibido}/{tamano} bytes)")
+        os.replace(parte, local)
+        self._partes.pop(parte, None)
+
+    def _descargar_remoto(self, remoto_abs: str, local: str):
+        """🆕 v15.2: Lectura por bloques con ventana de prefetch configurable (en vez de sftp.get).
+        Se escribe en un .part; si _ejecutar reintenta, se continúa desde lo ya recibido.
+        """
+        t_inicio = time.time()
+        bloque = self.config.SFTP_BLOQUE_KB * 1024
+        parte = local + '.part'
+        with self._sftp.open(remoto_abs, 'rb', bufsize=bloque) as remoto:
+            atributos = remoto.stat()
+            tamano = atributos.st_size
+            offset = self._offset_parte(parte, tamano, atributos.st_mtime)
+            if offset:
+                self.log.debug(f"Reanudando descarga desde {offset/1024:.0f} KB de {tamano/1024:.0f} KB")
+                remoto.seek(offset)
+            # prefetch lee desde la posición actual hasta file_size
+            try:
+                remoto.prefetch(tamano, max_concurrent_requests=self.config.SFTP_VENTANA_PREFETCH)
+            except TypeError:
+                remoto.prefetch(tamano)  # paramiko < 3.3 no limita la ventana
+            with open(parte, 'ab' if offset else 'wb') as f:
+                while True:
+                    datos = remoto.read(bloque)
+                    if not datos:
+                        break
+                    f.write(datos)
+        self._finalizar_parte(parte, local, tamano)
+        self.log.transfer(posixpath.basename(remoto_abs), tamano - offset, time.time() - t_inicio)
+
+    def desconectar(self):
+        self._cerrar()
+        self.log.info("Conexión SFTP cerrada")
+
+    @property
+    def path_actual(self) -> str:
+        return self._current_path
+
+    @property
+    def reconexiones(self) -> int:
+        return self._reconexiones
+
+class ConexionesAsyncSSH:
+    """🆕 v15.2: Conexiones asyncssh compartidas, atendidas por un event loop en un hilo propio.
+    Las operaciones de todas las sesiones se multiplexan sobre pocas conexiones SSH
+    (cada una con su canal SFTP); los pedidos concurrentes viajan en paralelo por el canal.
+    """
+
+    def __init__(self, config: Config, logger: Logger, n_conexiones: int):
+        import asyncssh
+        self._asyncssh = asyncssh
+        self.config = config
+        self.log = logger
+        self.n_conexiones = max(1, n_conexiones)
+        self._slots: List[Dict] = [{'conn': None, 'sftp': None, 'caida': True} for _ in range(self.n_conexiones)]
+        self._siguiente = 0
+        self.handshakes = 0
+        self._loop = asyncio.new_event_loop()
+        self._hilo = threading.Thread(target=self._loop.run_forever, name='sftp-asyncio', daemon=True)
+        self._hilo.start()
+        self._lock_apertura = None  # asyncio.Lock, se crea dentro del loop
+
+    def ejecutar(self, coro, timeout: float = None):
+        """Corre una corrutina en el loop de fondo y espera su resultado (fachada síncrona)."""
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result(timeout)
+
+    def _fabrica_cliente(self, slot: Dict):
+        asyncssh = self._asyncssh
+
+        class _ClienteSSH(asyncssh.SSHClient):
+            def connection_lost(self, exc):
+                slot['caida'] = True
+
+        return _ClienteSSH
+
+    async def _abrir(self, slot: Dict):
+        conn, _ = await self._asyncssh.create_connection(
+            self._fabrica_cliente(slot), self.config.HOST, self.config.PORT,
+            username=self.config.USERNAME,
+            password=self.config.PASSWORD,
+            known_hosts=None,
+            connect_timeout=self.config.TIMEOUT_CONEXION,
+            login_timeout=self.config.TIMEOUT_CONEXION,
+            keepalive_interval=self.config.KEEPALIVE_INTERVAL
+        )
+        slot['conn'] = conn
+        slot['sftp'] = await conn.start_sftp_client()
+        slot['caida'] = False
+        self.handshakes += 1
+
+    async def _cerrar_slot(self, slot: Dict):
+        conn = slot['conn']
+        slot.update({'conn': None, 'sftp': None, 'caida': True})
+        if conn:
+            conn.close()
+            try:
+                await conn.wait_closed()
+            except Exception:
+                pass
+
+    async def _asegurar(self, slot: Dict):
+        if self._lock_apertura is None:
+            self._lock_apertura = asyncio.Lock()
+        async with self._lock_apertura:
+            if slot['caida']:
+                await self._cerrar_slot(slot)
+                await self._abrir(slot)
+
+    async def conectar(self, forzar: bool = False):
+        """Abre (o reabre) las conexiones caídas; con forzar, todas."""
+        for intento in range(self.config.MAX_REINTENTOS_CONEXION):
+            try:
+                for slot in self._slots:
+                    if forzar:
+                        slot['caida'] = True
+                    await self._asegurar(slot)
+                return True
+            except (OSError, asyncio.TimeoutError, self._asyncssh.Error):
+                if intento < self.config.MAX_REINTENTOS_CONEXION - 1:
+                    await asyncio.sleep(self.config.BACKOFF_BASE ** intento)
+        return False
+
+    async def sftp(self):
+        """Canal SFTP de la siguiente conexión (round-robin), reabriéndola si cayó."""
+        slot = self._slots[self._siguiente % self.n_conexiones]
+        self._siguiente += 1
+        if slot['caida']:
+            await self._asegurar(slot)
+        return slot
+
+    async def _operar(self, operacion):
+        slot = await self.sftp()
+        try:
+            return await operacion(slot['sftp'])
+        except (OSError, self._asyncssh.ConnectionLost, self._asyncssh.DisconnectError):
+            slot['caida'] = True
+            raise
+
+    async def listar(self, ruta_abs: str) -> List[Dict]:
+        async def _op(sftp):
+            return [
+                {
+                    'nombre': n.filename,
+                    'tamano': n.attrs.size,
+                    'es_directorio': stat.S_ISDIR(n.attrs.permissions or 0),
+                    'fecha_modificacion': n.attrs.mtime
+                }
+                for n in await sftp.readdir(ruta_abs)
+                if n.filename not in ('.', '..')
+            ]
+        return await self._operar(_op)
+
+    async def resolver_directorio(self, ruta_abs: str) -> str:
+        async def _op(sftp):
+            real = await sftp.realpath(ruta_abs)
+            if not await sftp.isdir(real):
+                raise NotADirectoryError(ruta_abs)
+            return real
+        return await self._operar(_op)
+
+    async def atributos(self, remoto_abs: str):
+        async def _op(sftp):
+            return await sftp.stat(remoto_abs)
+        return await self._operar(_op)
+
+    async def descargar(self, remoto_abs: str, local: str, offset: int = 0):
+        """Descarga a local; con offset > 0 agrega el resto del archivo (lecturas secuenciales)."""
+        bloque = self.config.SFTP_BLOQUE_KB * 1024
+
+        async def _op(sftp):
+            if not offset:
+                await sftp.get(remoto_abs, local, block_size=bloque,
+                               max_requests=self.config.SFTP_VENTANA_PREFETCH)
+                return
+            async with sftp.open(remoto_abs, 'rb') as remoto:
+                with open(local, 'ab') as f:
+                    posicion = offset
+                    while True:
+                        datos = await remoto.read(bloque, posicion)
+                        if not datos:
+                            break
+                        f.write(datos)
+                        posicion += len(datos)
+        return await self._operar(_op)
+
+    def activo(self) -> bool:
+        return all(not slot['caida'] for slot in self._slots)
+
+    def cerrar(self):
+        if self._loop.is_closed():
+            return
+        async def _cerrar_todas():
+            await asyncio.gather(*(self._cerrar_slot(s) for s in self._slots))
+        try:
+            self.ejecutar(_cerrar_todas(), 10)
+        except Exception:
+            pass
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._hilo.join(5)
+
+
+class SFTPClientAsyncio(SFTPClient):
+    """🆕 v15.2: Misma interfaz que SFTPClient sobre ConexionesAsyncSSH (asyncssh).
+    Las conexiones pueden ser compartidas por varias sesiones; cada sesión solo
+    guarda su ruta actual. Los reintentos siguen pasando por _ejecutar.
+    """
+
+    # Con conexiones compartidas reconectar_forzado solo reabre las caídas: no hay reciclaje real
+    RECICLABLE = False
+
+    def __init__(self, config: Config, logger: Logger, cache_listados: CacheListados = None,
+                 cache_descargas: CacheDescargas = None, conexiones: ConexionesAsyncSSH = None,
+                 indice_remoto: IndiceRemoto = None):
+        super().__init__(config, logger, cache_listados, cache_descargas, indice_remoto)
+        self._propias = conexiones is None
+        self._conexiones = conexiones or ConexionesAsyncSSH(config, logger, config.CONEXIONES_ASYNC)
+
+    def _cerrar(self):
+        # Las conexiones compartidas solo las cierra su dueño
+        if self._propias:
+            self._conexiones.cerrar()
+
+    def conectar(self, silencioso: bool = False) -> bool:
+        if not silencioso:
+            self.log.info(f"Conectando a {self.config.HOST}:{self.config.PORT} (asyncio, "
+                          f"{self._conexiones.n_conexiones} conexiones)...")
+        t_inicio, handshakes_antes = time.time(), self._conexiones.handshakes
+        ok = self._conexiones.ejecutar(self._conexiones.conectar())
+        self.tiempo_conexion += time.time() - t_inicio
+        self.handshakes += self._conexiones.handshakes - handshakes_antes
+        if ok:
+            self._current_path = "/"
+            self.conectado_desde = time.time()
+            self.bytes_conexion = 0
+            self.resultados_ops.clear()
+            if not silencioso:
+                self.log.success("Conexión establecida")
+        elif not silencioso:
+            self.log.error("No se pudo conectar después de varios intentos")
+        return ok
 
-    def reconectar_forzado(self, silencioso: bool = True) -> bool:
-        """🆕 v14.1: Fuerza reconexión."""
+    def reconectar_forzado(self, silencioso: bool = True, espera: float = 0.5) -> bool:
+        """Reabre solo las conexiones caídas: forzar las compartidas cortaría a las otras sesiones."""
         self._reconexiones += 1
-        self._cerrar()
-        time.sleep(0.5)
         return self.conectar(silencioso)
 
     def esta_activo(self) -> bool:
-        try:
-            if not self._sftp or not self._transport: return False
-            if not self._transport.is_active(): return False
-            self._sftp.getcwd()
-            return True
-        except:
-            return False
+        return self._conexiones.activo()
 
-    def _ejecutar(self, operacion: Callable, descripcion: str = "operación"):
-        for intento in range(self.config.MAX_REINTENTOS_OPERACION):
-            try:
-                if not self.esta_activo():
-                    self._reconexiones += 1
-                    self.log.warning("Reconectando...", f"intento {self._reconexiones}")
-                    if not self.conectar(True):
-                        raise Exception("Reconexión fallida")
-                return operacion()
-            except Exception as e:
-                if intento == self.config.MAX_REINTENTOS_OPERACION - 1:
-                    raise
-                time.sleep(1)
-
-    def listar(self, ruta: str = '.') -> List[Dict]:
-        def _op():
-            return [
-                {
-                    'nombre': a.filename,
-                    'tamano': a.st_size,
-                    'es_directorio': stat.S_ISDIR(a.st_mode),
-                    'fecha_modificacion': a.st_mtime
-                }
-                for a in self._sftp.listdir_attr(ruta)
-            ]
-        return self._ejecutar(_op)
+    def _listar_remoto(self, ruta_abs: str) -> List[Dict]:
+        return self._conexiones.ejecutar(self._conexiones.listar(ruta_abs), self.config.TIMEOUT_OPERACION)
 
     def cd(self, ruta: str, log_nav: bool = True):
-        def _op():
-            self._sftp.chdir(ruta)
-            self._current_path = self._sftp.getcwd() or ruta
-        self._ejecutar(_op)
+        ruta_abs = self.ruta_absoluta(ruta)
+        self._current_path = self._ejecutar(lambda: self._conexiones.ejecutar(
+            self._conexiones.resolver_directorio(ruta_abs), self.config.TIMEOUT_OPERACION
+        ))
         if log_nav:
             self.log.nav(self._current_path)
 
-    def descargar(self, remoto: str, local: str, log_download: bool = True):
-        if log_download:
-            self.log.download(remoto)
-        self._ejecutar(lambda: self._sftp.get(remoto, local))
+    def _descargar_remoto(self, remoto_abs: str, local: str):
+        t_inicio = time.time()
+        parte = local + '.part'
+        atributos = self._conexiones.ejecutar(self._conexiones.atributos(remoto_abs), self.config.TIMEOUT_OPERACION)
+        tamano = atributos.size
+        offset = self._offset_parte(parte, tamano, atributos.mtime)
+        if offset:
+            self.log.debug(f"Reanudando descarga desde {offset/1024:.0f} KB de {tamano/1024:.0f} KB")
+        self._conexiones.ejecutar(self._conexiones.descargar(remoto_abs, parte, offset))
+        self._finalizar_parte(parte, local, tamano)
+        self.log.transfer(posixpath.basename(remoto_abs), tamano - offset, time.time() - t_inicio)
+
+
+class GestorConexiones:
+    """🆕 v15.2: Decide cuándo reciclar la conexión de una sesión según su salud.
+    Se recicla si está caída, si superó la edad máxima, si transfirió demasiados
+    bytes o si la tasa de errores reciente es alta; si no, se reutiliza tal cual.
+    Con clientes no reciclables (asyncio) solo se atiende la caída.
+    """
 
-    def desconectar(self):
-        self._cerrar()
-        self.log.info("Conexión SFTP cerrada")
+    def __init__(self, config: Config, logger: Logger):
+        self.config = config
+        self.log = logger
+        self._lock = threading.Lock()
+        self.reciclajes: Dict[str, int] = {}
 
-    @property
-    def path_actual(self) -> str:
-        return self._current_path
+    def motivo_reciclaje(self, cli: SFTPClient) -> Optional[str]:
+        if not cli.esta_activo():
+            return 'caida'
+        if not cli.RECICLABLE:
+            return None
+        if time.time() - cli.conectado_desde > self.config.RECICLAR_EDAD_MAX_S:
+            return 'edad'
+        if cli.bytes_conexion > self.config.RECICLAR_MAX_MB * 1024 * 1024:
+            return 'volumen'
+        ops = cli.resultados_ops
+        if len(ops) >= max(1, ops.maxlen // 2):
+            tasa_errores = ops.count(False) / len(ops)
+            if tasa_errores > self.config.RECICLAR_TASA_ERRORES:
+                return 'errores'
+        return None
+
+    def asegurar(self, cli: SFTPClient, etiqueta: str = "") -> bool:
+        """Deja la conexión lista para usarse; retorna False si no se pudo conectar."""
+        motivo = self.motivo_reciclaje(cli)
+        if motivo is None:
+            return True
+
+        with self._lock:
+            self.reciclajes[motivo] = self.reciclajes.get(motivo, 0) + 1
+        self.log.debug(f"Reciclando conexión {etiqueta} (motivo: {motivo})")
+
+        if cli.reconectar_forzado(silencioso=True, espera=0.5 if motivo == 'caida' else 0):
+            self.log.success("Conexión renovada")
+            return True
+        for intento in range(3):
+            if cli.conectar(True):
+                return True
+            self.log.warning(f"Reintento de conexión {intento + 1}/3...")
+            time.sleep(2)
+        return False
+
+    def resumen(self, clientes: List[SFTPClient]) -> str:
+        handshakes = sum(c.handshakes for c in clientes)
+        tiempo = sum(c.tiempo_conexion for c in clientes)
+        motivos = ", ".join(f"{k}: {v}" for k, v in sorted(self.reciclajes.items())) or "ninguno"
+        return f"{handshakes} handshakes, {tiempo:.1f}s conectando | reciclajes: {motivos}"
+
+
+def crear_cliente_sftp(config: Config, logger: Logger, **kwargs) -> SFTPClient:
+    """🆕 v15.2: Crea el cliente SFTP según CONFIG.CLIENTE_SFTP."""
+    if config.CLIENTE_SFTP == 'asyncio':
+        return SFTPClientAsyncio(config, logger, **kwargs)
+    kwargs.pop('conexiones', None)
+    return SFTPClient(config, logger, **kwargs)
 
-    @property
-    def reconexiones(self) -> int:
-        return self._reconexiones
 
 LOG.success("Cliente SFTP v14.1 configurado")
-LOG.success("🆕 Reconexión forzada por contrato habilitada")
+LOG.success("🆕 Reciclaje de conexiones por salud (edad, volumen, errores)")
+LOG.success("🆕 Cache de listados remotos", f"TTL {CONFIG.CACHE_LISTADOS_TTL}s, máx {CONFIG.CACHE_LISTADOS_MAX} rutas")
+LOG.success("🆕 Cache de descargas", f"{CONFIG.CARPETA_CACHE_DESCARGAS} (máx {CONFIG.CACHE_DESCARGAS_MAX_MB} MB)")
+LOG.success("🆕 Cliente SFTP", CONFIG.CLIENTE_SFTP)
 LOG.dedent()
 
 # ══════════════════════════════════════════════════════════════════════════════
@@ -2910,6 +4462,39 @@ LOG.dedent()
 LOG.step(5, 6, "CONFIGURANDO BUSCADOR DE ANEXOS v14.1")
 LOG.indent()
 
+class IndiceCarpetasContrato:
+    """🆕 v15.2: Índice de las carpetas de un año, construido una sola vez.
+    - primeros: primer token del nombre (separado por espacio, - o _) → primera carpeta
+    - proveedores: búsquedas por nombre de proveedor ya resueltas (memo)
+    """
+
+    def __init__(self, carpetas: List[str]):
+        self.carpetas = carpetas
+        self.primeros: Dict[str, str] = {}
+        for carpeta in carpetas:
+            partes = re.split(r'[\s\-_]', carpeta)
+            if partes:
+                self.primeros.setdefault(partes[0], carpeta)
+        self._mayusculas = [(c.upper(), c) for c in carpetas]
+        self.proveedores: Dict[str, Optional[str]] = {}
+
+    def por_numero(self, variantes: List[str]) -> Optional[Tuple[str, str]]:
+        """Primera variante (en orden de prioridad) con carpeta. Retorna (variante, carpeta)."""
+        for variante in variantes:
+            carpeta = self.primeros.get(variante)
+            if carpeta is not None:
+                return variante, carpeta
+        return None
+
+    def por_proveedor(self, nombre_proveedor: str) -> Optional[str]:
+        nombre_limpio = nombre_proveedor.upper().strip()
+        if nombre_limpio not in self.proveedores:
+            self.proveedores[nombre_limpio] = next(
+                (c for mayus, c in self._mayusculas if nombre_limpio in mayus), None
+            )
+        return self.proveedores[nombre_limpio]
+
+
 class BuscadorAnexos:
     """🆕 v14.1: Buscador de anexos con búsqueda mejorada."""
 
@@ -2919,10 +4504,31 @@ class BuscadorAnexos:
         self.log = logger
         self.alertas: List[Alerta] = []
         self._contrato_actual = ""
+        # 🆕 v15.2: Ruta absoluta del último contrato encontrado (reemplaza el cd acumulado)
+        self.ruta_contrato: Optional[str] = None
+        # 🆕 v15.2: Claves (ruta|tamaño|fecha) que el manifiesto ya tiene extraídas
+        self.claves_reutilizables: Set[str] = set()
+        # 🆕 v15.2: Índices de carpetas por ruta de año: ruta → (items del listado, índice)
+        self._indices_carpetas: Dict[str, Tuple[List[Dict], IndiceCarpetasContrato]] = {}
 
     def limpiar_alertas(self):
         self.alertas = []
 
+    def set_reutilizables(self, claves):
+        self.claves_reutilizables = set(claves or ())
+
+    def _traer_archivo(self, remoto: str, local: str, item: Dict, log_download: bool = True) -> bool:
+        """🆕 v15.2: Descarga el archivo salvo que el manifiesto ya lo tenga. Retorna True si se reutiliza."""
+        clave = ManifiestoEjecucion.clave_archivo(remoto, item.get('tamano'), item.get('fecha_modificacion'))
+        if clave and clave in self.claves_reutilizables:
+            self.log.debug(f"Sin cambios desde la última ejecución: {item['nombre']}")
+            return True
+        self.cliente.descargar(
+            remoto, local, log_download=log_download,
+            tamano=item.get('tamano'), fecha_modificacion=item.get('fecha_modificacion')
+        )
+        return False
+
     def set_contrato(self, contrato: str):
         self._contrato_actual = contrato
 
@@ -2997,8 +4603,23 @@ class BuscadorAnexos:
             if texto_l in c.lower(): return c
         return None
 
-    def buscar_carpeta_contrato(self, carpetas: List[str], numero: str, nombre_proveedor: str = None) -> Optional[str]:
-        """🆕 v14.1: Búsqueda mejorada con cero inicial."""
+    def indice_carpetas(self, ruta_ano: str, items: List[Dict]) -> IndiceCarpetasContrato:
+        """🆕 v15.2: Índice de la carpeta de año; se reconstruye solo si cambia el listado."""
+        previo = self._indices_carpetas.get(ruta_ano)
+        if previo and previo[0] is items:
+            return previo[1]
+        indice = IndiceCarpetasContrato([i['nombre'] for i in items if i['es_directorio']])
+        self._indices_carpetas[ruta_ano] = (items, indice)
+        return indice
+
+    def buscar_carpeta_contrato(self, carpetas: List[str], numero: str, nombre_proveedor: str = None,
+                                indice: IndiceCarpetasContrato = None) -> Optional[str]:
+        """🆕 v14.1: Búsqueda mejorada con cero inicial.
+        🆕 v15.2: Consulta un IndiceCarpetasContrato (por número y proveedor) en vez
+        de recorrer las carpetas por cada variante.
+        """
+        if indice is None:
+            indice = IndiceCarpetasContrato(carpetas)
         num = ''.join(filter(str.isdigit, str(numero)))
 
         variantes = [
@@ -3014,36 +4635,31 @@ class BuscadorAnexos:
 
         self.log.debug(f"Buscando contrato con variantes: {variantes_unicas}")
 
-        for variante in variantes_unicas:
-            for carpeta in carpetas:
-                partes = re.split(r'[\s\-_]', carpeta)
-                if partes and partes[0] == variante:
-                    self.log.debug(f"Encontrado con variante '{variante}': {carpeta}")
-                    return carpeta
-
-        for variante in variantes_unicas:
-            for carpeta in carpetas:
-                if carpeta.startswith(variante + '-') or carpeta.startswith(variante + '_') or carpeta.startswith(variante + ' '):
-                    self.log.debug(f"Encontrado por prefijo '{variante}': {carpeta}")
-                    return carpeta
+        # El prefijo "variante-", "variante_" o "variante " ya es primer token: basta el índice
+        encontrado = indice.por_numero(variantes_unicas)
+        if encontrado:
+            variante, carpeta = encontrado
+            self.log.debug(f"Encontrado con variante '{variante}': {carpeta}")
+            return carpeta
 
         if nombre_proveedor:
-            nombre_limpio = nombre_proveedor.upper().strip()
-            for carpeta in carpetas:
-                if nombre_limpio in carpeta.upper():
-                    self.log.debug(f"Encontrado por nombre proveedor: {carpeta}")
-                    return carpeta
+            carpeta = indice.por_proveedor(nombre_proveedor)
+            if carpeta:
+                self.log.debug(f"Encontrado por nombre proveedor: {carpeta}")
+                return carpeta
 
         return None
 
     def navegar_a_contrato(self, ano: str, numero: str, nombre_proveedor: str = None) -> Tuple[bool, str, Optional[str]]:
-        """🆕 v14.1: Navega con búsqueda mejorada."""
+        """🆕 v14.1: Navega con búsqueda mejorada.
+        🆕 v15.2: Resuelve rutas absolutas sobre los listados (sin cd/getcwd).
+        """
         try:
             self.log.info("Navegando a contrato...")
             self.log.indent()
+            self.ruta_contrato = None
 
-            self.cliente.cd('/', log_nav=False)
-            items = self.cliente.listar()
+            items = self.cliente.listar('/')
             carpetas = [i['nombre'] for i in items if i['es_directorio']]
 
             cp = self.buscar_carpeta(carpetas, self.config.CARPETA_PRINCIPAL)
@@ -3052,9 +4668,10 @@ class BuscadorAnexos:
                 self.log.dedent()
                 return False, "Sin carpeta principal", None
 
-            self.cliente.cd(cp)
+            ruta_principal = posixpath.join('/', cp)
+            self.log.nav(ruta_principal)
 
-            items = self.cliente.listar()
+            items = self.cliente.listar(ruta_principal)
             carpetas = [i['nombre'] for i in items if i['es_directorio']]
             ca = self.buscar_carpeta(carpetas, f'contratos {ano}')
             if not ca:
@@ -3062,12 +4679,14 @@ class BuscadorAnexos:
                 self.log.dedent()
                 return False, f"Sin año {ano}", None
 
-            self.cliente.cd(ca)
+            ruta_ano = posixpath.join(ruta_principal, ca)
+            self.log.nav(ruta_ano)
 
-            items = self.cliente.listar()
-            carpetas = [i['nombre'] for i in items if i['es_directorio']]
+            items = self.cliente.listar(ruta_ano)
+            indice = self.indice_carpetas(ruta_ano, items)
+            carpetas = indice.carpetas
 
-            cc = self.buscar_carpeta_contrato(carpetas, numero, nombre_proveedor)
+            cc = self.buscar_carpeta_contrato(carpetas, numero, nombre_proveedor, indice)
 
             if not cc:
                 self.log.error("No encontrada", f"carpeta contrato {numero}")
@@ -3082,19 +4701,23 @@ class BuscadorAnexos:
                 self.log.dedent()
                 return False, f"CONTRATO NO SE ENCUENTRA EN EL GO ANYWHERE", None
 
-            self.cliente.cd(cc)
+            self.ruta_contrato = posixpath.join(ruta_ano, cc)
+            self.log.nav(self.ruta_contrato)
             self.log.success("Contrato encontrado", cc)
             self.log.dedent()
 
-            return True, "OK", f"/{cp}/{ca}/{cc}"
+            return True, "OK", self.ruta_contrato
 
         except Exception as e:
             self.log.error("Error de navegación", str(e)[:40])
             self.log.dedent()
             return False, str(e)[:40], None
 
-    def descargar_anexos(self, carpeta_destino: str, id_contrato: str) -> Dict:
-        """Descarga ANEXO 1 con logging detallado."""
+    def descargar_anexos(self, carpeta_destino: str, id_contrato: str, ruta_contrato: str = None) -> Dict:
+        """Descarga ANEXO 1 con logging detallado.
+        🆕 v15.2: Trabaja sobre rutas absolutas desde ruta_contrato (por defecto,
+        la última resuelta por navegar_a_contrato).
+        """
         resultado = {
             'exito': False,
             'archivos': [],
@@ -3107,7 +4730,8 @@ class BuscadorAnexos:
             self.log.info("Buscando archivos ANEXO 1...")
             self.log.indent()
 
-            items = self.cliente.listar()
+            ruta_base = ruta_contrato or self.ruta_contrato or self.cliente.path_actual
+            items = self.cliente.listar(ruta_base)
             carpetas = [i['nombre'] for i in items if i['es_directorio']]
             archivos = [i['nombre'] for i in items if not i['es_directorio']]
 
@@ -3127,8 +4751,9 @@ class BuscadorAnexos:
                 resultado['mensaje'] = "Sin TARIFAS"
                 return resultado
 
-            self.cliente.cd(carpeta_tarifas)
-            items_tarifas = self.cliente.listar()
+            ruta_tarifas = posixpath.join(ruta_base, carpeta_tarifas)
+            self.log.nav(ruta_tarifas)
+            items_tarifas = self.cliente.listar(ruta_tarifas)
 
             archivos_excel = [i for i in items_tarifas if not i['es_directorio'] and es_extension_excel(i['nombre'])]
             subcarpetas = [i for i in items_tarifas if i['es_directorio']]
@@ -3193,7 +4818,8 @@ class BuscadorAnexos:
 
             if archivo_principal:
                 ruta_local = os.path.join(carpeta_destino, archivo_principal['nombre'])
-                self.cliente.descargar(archivo_principal['nombre'], ruta_local)
+                remoto_principal = posixpath.join(ruta_tarifas, archivo_principal['nombre'])
+                reutilizado = self._traer_archivo(remoto_principal, ruta_local, archivo_principal)
                 fecha_referencia = archivo_principal.get('fecha_modificacion')
                 resultado['archivos'].append(ArchivoAnexo(
                     nombre=archivo_principal['nombre'],
@@ -3201,7 +4827,10 @@ class BuscadorAnexos:
                     origen=origen_principal,
                     numero=numero_principal,
                     fecha_modificacion=fecha_referencia,
-                    origen_completo=f"/{carpeta_tarifas}/{archivo_principal['nombre']}"
+                    origen_completo=f"/{carpeta_tarifas}/{archivo_principal['nombre']}",
+                    ruta_remota=remoto_principal,
+                    tamano=archivo_principal.get('tamano'),
+                    reutilizado=reutilizado
                 ))
 
             carpetas_actas = [item for item in subcarpetas if 'acta' in item['nombre'].lower()]
@@ -3213,10 +4842,10 @@ class BuscadorAnexos:
 
             for carpeta_acta in carpetas_actas:
                 try:
-                    self.cliente.cd(carpeta_acta['nombre'], log_nav=False)
+                    ruta_actas = posixpath.join(ruta_tarifas, carpeta_acta['nombre'])
                     self.log.debug(f"Entrando a: {carpeta_acta['nombre']}")
 
-                    items_actas = self.cliente.listar()
+                    items_actas = self.cliente.listar(ruta_actas)
                     actas_excel = [i for i in items_actas if not i['es_directorio'] and es_extension_excel(i['nombre'])]
                     actas_en_carpeta = []
 
@@ -3237,7 +4866,8 @@ class BuscadorAnexos:
                             nombre_local = f"ACTA_{carpeta_acta['nombre']}_{ia['nombre']}"
                             nombre_local = re.sub(r'[<>:"/\\|?*]', '_', nombre_local)
                             ruta_acta = os.path.join(carpeta_destino, nombre_local)
-                            self.cliente.descargar(ia['nombre'], ruta_acta, log_download=False)
+                            remoto_acta = posixpath.join(ruta_actas, ia['nombre'])
+                            reutilizado = self._traer_archivo(remoto_acta, ruta_acta, ia, log_download=False)
                             self.log.file_found(ia['nombre'], f"Acta {num_acta or '?'}")
 
                             resultado['archivos'].append(ArchivoAnexo(
@@ -3246,7 +4876,10 @@ class BuscadorAnexos:
                                 origen=OrigenTarifa.ACTA,
                                 numero=num_acta,
                                 fecha_modificacion=fecha_acta,
-                                origen_completo=f"/{carpeta_tarifas}/{carpeta_acta['nombre']}/{ia['nombre']}"
+                                origen_completo=f"/{carpeta_tarifas}/{carpeta_acta['nombre']}/{ia['nombre']}",
+                                ruta_remota=remoto_acta,
+                                tamano=ia.get('tamano'),
+                                reutilizado=reutilizado
                             ))
 
                         if num_acta:
@@ -3261,8 +4894,6 @@ class BuscadorAnexos:
                             carpeta_acta['nombre']
                         )
 
-                    self.cliente.cd('..', log_nav=False)
-
                 except Exception as e_acta:
                     self.log.error(f"Error en carpeta actas", str(e_acta)[:30])
                     self.agregar_alerta(
@@ -3270,10 +4901,6 @@ class BuscadorAnexos:
                         f"Error procesando: {str(e_acta)[:30]}",
                         carpeta_acta['nombre']
                     )
-                    try:
-                        self.cliente.cd('..', log_nav=False)
-                    except:
-                        pass
 
             resultado['actas_encontradas'] = sorted(set(todas_las_actas))
 
@@ -3301,6 +4928,7 @@ class BuscadorAnexos:
 
 LOG.success("Buscador de anexos v14.1 configurado")
 LOG.success("🆕 Búsqueda con cero inicial habilitada")
+LOG.success("🆕 Navegación por rutas absolutas (sin cd/getcwd)")
 LOG.dedent()
 
 # ══════════════════════════════════════════════════════════════════════════════
@@ -3310,15 +4938,58 @@ LOG.dedent()
 LOG.step(6, 6, "CONFIGURANDO PROCESADOR DE ANEXOS v14.1")
 LOG.indent()
 
+# Patrones de encabezado por campo, en orden de prioridad
+PATRONES_COLUMNAS_SERVICIOS = [
+    ('cups', [
+        'CODIGO CUPS', 'CÓDIGO CUPS', 'COD CUPS', 'COD. CUPS',
+        'CODIGO CUP', 'COD CUP', 'COD. CUP'
+    ]),
+    ('homologo', [
+        'CODIGO HOMOLOGO', 'CÓDIGO HOMÓLOGO', 'COD HOMOLOGO',
+        'HOMOLOGO MANUAL', 'CÓDIGO HOMOLOGO MANUAL', 'CODIGO HOMOLOGO MANUAL'
+    ]),
+    ('descripcion', [
+        'DESCRIPCION DEL CUPS', 'DESCRIPCIÓN DEL CUPS',
+        'DESCRIPCION CUPS', 'DESCRIPCIÓN CUPS',
+        'DESCRIPCION DEL CUP', 'DESCRIPCIÓN DEL CUP'
+    ]),
+    ('tarifa', [
+        'TARIFA UNITARIA EN PESOS', 'TARIFA UNITARIA PESOS',
+        'TARIFA EN PESOS', 'TARIFA UNITARIA',
+        'VALOR UNITARIO', 'PRECIO UNITARIO'
+    ]),
+    ('tarifario', [
+        'MANUAL TARIFARIO', 'TARIFARIO', 'MANUAL TAR',
+        'TIPO TARIFARIO', 'TIPO DE TARIFARIO'
+    ]),
+    ('porcentaje', [
+        'TARIFA SEGUN TARIFARIO', 'TARIFA SEGÚN TARIFARIO',
+        'PORCENTAJE TARIFARIO', 'PORCENTAJE',
+        '% TARIFARIO', '% DEL TARIFARIO'
+    ]),
+    ('observaciones', [
+        'OBSERVACIONES', 'OBSERVACION', 'OBS', 'NOTAS'
+    ]),
+]
+
+# 🆕 v15.2: Los mismos patrones ya normalizados (una vez, al cargar), sin repetidos
+PATRONES_ORDENADOS = [
+    (campo, list(dict.fromkeys(normalizar_texto(p) for p in patrones)))
+    for campo, patrones in PATRONES_COLUMNAS_SERVICIOS
+]
+
+
 class ProcesadorAnexo:
     """🆕 v14.1: Procesador de anexos con detección de columnas mejorada."""
 
-    def __init__(self, logger: Logger):
+    def __init__(self, logger: Logger, pool: 'PoolParseo' = None):
         self.log = logger
         self._alertas_set: set = set()
         self.alertas: List[Alerta] = []
         self._contrato_actual = ""
         self._categoria_cuentas_medicas = ""
+        # 🆕 v15.2: Si hay pool, extraer_con_timeout parsea en un proceso aparte
+        self.pool = pool
 
     def limpiar_alertas(self):
         self._alertas_set = set()
@@ -3344,18 +5015,23 @@ class ProcesadorAnexo:
             self.alertas.append(nueva_alerta)
             self.log.alert(tipo.value, mensaje, archivo)
 
-    def buscar_hoja_servicios(self, archivo: str) -> Optional[str]:
+    def buscar_hoja_servicios(self, archivo: str, lector: WorkbookReader = None) -> Optional[str]:
         """🆕 v14.1: Busca la hoja de servicios - CORREGIDO.
         Las hojas de PAQUETES NO generan alerta individual, solo se mencionan
         si no hay hoja de servicios válida.
+        🆕 v15.2: Reutiliza el WorkbookReader del llamador si se entrega.
         """
-        formato_real = detectar_formato_real(archivo)
-        ext_declarada = os.path.splitext(archivo)[1].lower()
+        if lector is None:
+            with WorkbookReader(archivo) as lector_propio:
+                return self.buscar_hoja_servicios(archivo, lector_propio)
+
+        formato_real = lector.formato
+        ext_declarada = lector.ext
 
         if formato_real == 'xlsb' and ext_declarada != '.xlsb':
             self.log.debug(f"⚠️ Formato real: XLSB (extensión: {ext_declarada})")
 
-        hojas = obtener_hojas(archivo)
+        hojas = lector.hojas
 
         if not hojas:
             motivo = f"No se pudo leer archivo (formato: {formato_real})"
@@ -3427,39 +5103,6 @@ class ProcesadorAnexo:
 
         columnas_usadas = set()
 
-        PATRONES_ORDENADOS = [
-            ('cups', [
-                'CODIGO CUPS', 'CÓDIGO CUPS', 'COD CUPS', 'COD. CUPS',
-                'CODIGO CUP', 'COD CUP', 'COD. CUP'
-            ]),
-            ('homologo', [
-                'CODIGO HOMOLOGO', 'CÓDIGO HOMÓLOGO', 'COD HOMOLOGO',
-                'HOMOLOGO MANUAL', 'CÓDIGO HOMOLOGO MANUAL', 'CODIGO HOMOLOGO MANUAL'
-            ]),
-            ('descripcion', [
-                'DESCRIPCION DEL CUPS', 'DESCRIPCIÓN DEL CUPS',
-                'DESCRIPCION CUPS', 'DESCRIPCIÓN CUPS',
-                'DESCRIPCION DEL CUP', 'DESCRIPCIÓN DEL CUP'
-            ]),
-            ('tarifa', [
-                'TARIFA UNITARIA EN PESOS', 'TARIFA UNITARIA PESOS',
-                'TARIFA EN PESOS', 'TARIFA UNITARIA',
-                'VALOR UNITARIO', 'PRECIO UNITARIO'
-            ]),
-            ('tarifario', [
-                'MANUAL TARIFARIO', 'TARIFARIO', 'MANUAL TAR',
-                'TIPO TARIFARIO', 'TIPO DE TARIFARIO'
-            ]),
-            ('porcentaje', [
-                'TARIFA SEGUN TARIFARIO', 'TARIFA SEGÚN TARIFARIO',
-                'PORCENTAJE TARIFARIO', 'PORCENTAJE',
-                '% TARIFARIO', '% DEL TARIFARIO'
-            ]),
-            ('observaciones', [
-                'OBSERVACIONES', 'OBSERVACION', 'OBS', 'NOTAS'
-            ]),
-        ]
-
         for i, celda in enumerate(fila):
             t = normalizar_texto(celda)
             if not t:
@@ -3472,9 +5115,8 @@ class ProcesadorAnexo:
                 if idx[campo] != -1:
                     continue
 
-                for patron in patrones:
-                    patron_norm = normalizar_texto(patron)
-
+                # 🆕 v15.2: PATRONES_ORDENADOS ya viene normalizado
+                for patron_norm in patrones:
                     if patron_norm in t or patron_norm == t:
                         if campo == 'cups' and 'HOMOLOGO' in t:
                             continue
@@ -3502,21 +5144,24 @@ class ProcesadorAnexo:
 
         return idx
 
-    def extraer_sedes_de_bloque(self, datos: List[List], inicio: int, idx_hab: int, idx_sede: int) -> List[Dict]:
-        """Extrae las sedes de un bloque de datos de sedes."""
+    def extraer_sedes_de_bloque(self, filas, idx_hab: int, idx_sede: int) -> List[Dict]:
+        """Extrae las sedes de un bloque de datos de sedes.
+        🆕 v15.2: Recibe las filas siguientes al encabezado (p. ej. IteradorFilas.adelante()).
+        """
         sedes = []
-        k = inicio
 
-        while k < len(datos) and len(sedes) < CONFIG.MAX_SEDES:
-            fila = datos[k]
+        for fila in filas:
+            if len(sedes) >= CONFIG.MAX_SEDES:
+                break
             if not fila:
-                k += 1
                 continue
 
-            if es_encabezado_seccion_sedes(fila) or es_encabezado_seccion_servicios(fila):
+            # 🆕 v15.2: Rasgos de la fila compartidos por todos los predicados
+            rasgos = RowFeatures(fila)
+            if es_encabezado_seccion_sedes(rasgos) or es_encabezado_seccion_servicios(rasgos):
                 break
 
-            if es_dato_de_sede(fila):
+            if es_dato_de_sede(rasgos):
                 if idx_hab >= 0 and idx_hab < len(fila):
                     codigo_hab = fila[idx_hab]
                     if codigo_hab:
@@ -3528,7 +5173,6 @@ class ProcesadorAnexo:
                         if codigo_clean and codigo_clean.isdigit() and 5 <= len(codigo_clean) <= 12:
                             num_sede = fila[idx_sede] if idx_sede >= 0 and idx_sede < len(fila) else len(sedes) + 1
                             sedes.append({'codigo': codigo_hab, 'sede': num_sede})
-                            k += 1
                             continue
 
             if fila[0] is not None:
@@ -3537,34 +5181,91 @@ class ProcesadorAnexo:
                     if primera and not primera.isspace():
                         break
 
-            k += 1
-
         return sedes
 
+    # 🆕 v15.2: Mensajes de debug de los rechazos que antes se registraban fila a fila
+    MENSAJES_RECHAZO = {
+        MotivoRechazo.TARIFA_TELEFONO: "Tarifa rechazada (parece teléfono)",
+        MotivoRechazo.MANUAL_DIRECCION: "Manual rechazado (parece dirección)",
+        MotivoRechazo.MANUAL_TELEFONO: "Manual rechazado (parece teléfono)",
+        MotivoRechazo.DESCRIPCION_NUMERO_SEDE: "Descripción rechazada (es número de sede)",
+        MotivoRechazo.DESCRIPCION_MUNICIPIO_DEPARTAMENTO: "Descripción rechazada (es municipio/departamento)",
+    }
+
+    def _validar_pendientes(self, pendientes: List[Tuple], servicios: List[Dict]):
+        """🆕 v15.2: Valida en lote las filas candidatas acumuladas y agrega sus servicios (en orden).
+        Cada candidata: (i, cups, fila, rasgos, idx_columnas, sedes).
+        """
+        if not pendientes:
+            return
+        lote = list(pendientes)
+        pendientes.clear()
+
+        def get_valor(fila: list, idx_columnas: Dict[str, int], campo: str):
+            col_idx = idx_columnas.get(campo, -1)
+            return fila[col_idx] if 0 <= col_idx < len(fila) else None
+
+        resultado = validar_servicios_lote(
+            [c[1] for c in lote],
+            [get_valor(c[2], c[4], 'tarifa') for c in lote],
+            [get_valor(c[2], c[4], 'tarifario') for c in lote],
+            [get_valor(c[2], c[4], 'descripcion') for c in lote],
+            filas=[c[3] for c in lote],
+        )
+        for motivo, cantidad in resultado.conteos.items():
+            self.log.incrementar(f'rechazo_{motivo}', cantidad)
+
+        for (i, cups, fila, _, idx_columnas, sedes), valido, motivo in zip(lote, resultado.validos, resultado.motivos):
+            if not valido:
+                if motivo in self.MENSAJES_RECHAZO:
+                    self.log.debug(f"Fila {i+1}: {self.MENSAJES_RECHAZO[motivo]}")
+                continue
+
+            tarifa = get_valor(fila, idx_columnas, 'tarifa')
+            base = {
+                'codigo_cups': cups,
+                'codigo_homologo_manual': limpiar_codigo(get_valor(fila, idx_columnas, 'homologo')),
+                'descripcion_del_cups': limpiar_texto(get_valor(fila, idx_columnas, 'descripcion')),
+                'tarifa_unitaria_en_pesos': limpiar_tarifa(tarifa),
+                'manual_tarifario': limpiar_texto(get_valor(fila, idx_columnas, 'tarifario')),
+                'porcentaje_manual_tarifario': limpiar_texto(get_valor(fila, idx_columnas, 'porcentaje')),
+                'observaciones': limpiar_texto(get_valor(fila, idx_columnas, 'observaciones'))
+            }
+
+            for sede in sedes:
+                s = base.copy()
+                s['codigo_de_habilitacion'] = formatear_habilitacion(sede['codigo'], sede['sede'])
+                servicios.append(s)
+
     def extraer_servicios(self, archivo: str, nombre: str) -> Tuple[bool, List[Dict], str]:
-        """Extrae servicios del archivo ANEXO 1."""
+        """Extrae servicios del archivo ANEXO 1.
+        🆕 v15.2: Las filas candidatas se validan por lotes (validar_servicios_lote).
+        """
+        lector = None
         try:
             self.log.process(f"Procesando: {nombre[:50]}...")
             self.log.indent()
 
-            hoja = self.buscar_hoja_servicios(archivo)
+            # 🆕 v15.2: Un solo WorkbookReader para formato, hojas y lectura
+            lector = WorkbookReader(archivo)
+
+            hoja = self.buscar_hoja_servicios(archivo, lector)
             if not hoja:
                 self.log.error("No se encontró hoja de servicios")
                 self.log.dedent()
                 return False, [], "Sin hoja de servicios"
 
-            formato = detectar_formato_real(archivo)
+            formato = lector.formato
             self.log.info(f"Hoja encontrada: '{hoja}' (formato: {formato})")
 
-            datos = leer_hoja_raw(archivo, hoja, max_filas=20000)
-            if not datos:
+            # 🆕 v15.2: Las filas se procesan a medida que se leen (sin materializar la hoja)
+            filas = IteradorFilas(lector.iterar_filas(hoja, max_filas=20000))
+            if filas.vacio():
                 self.log.error("Hoja vacía o no legible")
                 self.agregar_alerta(TipoAlerta.ERROR_LECTURA, "Hoja vacía", nombre)
                 self.log.dedent()
                 return False, [], "Hoja vacía"
 
-            self.log.debug(f"Filas leídas: {len(datos)}")
-
             servicios = []
             sedes_activas = []
             idx_columnas = None
@@ -3572,19 +5273,68 @@ class ProcesadorAnexo:
             encontro_sedes = False
 
             estado = 'buscando'
-
-            i = 0
-            while i < len(datos):
-                fila = datos[i]
+            cols_sedes = 0
+            # 🆕 v15.2: Detector de fin de tabla
+            fin_tabla = CONFIG.FIN_TABLA_FILAS_VACIAS
+            filas_sin_cups = 0
+            # 🆕 v15.2: Filas candidatas pendientes de validación por lote
+            pendientes = []
+
+            for i, fila in filas:
+                # 🆕 v15.2: Rasgos de la fila (texto, palabras clave...) calculados una sola vez
+                rasgos = RowFeatures(fila)
+                if fin_tabla > 0 and pendientes and not servicios and estado == 'en_servicios':
+                    # El detector arranca con el primer servicio válido: hasta entonces se valida sin esperar el lote
+                    self._validar_pendientes(pendientes, servicios)
+                if fin_tabla > 0 and servicios and estado == 'en_servicios':
+                    if 0 <= idx_columnas['cups'] < len(fila or []) and es_candidata_cups(fila[idx_columnas['cups']]):
+                        filas_sin_cups = 0
+                    elif not (fila and (es_encabezado_seccion_sedes(rasgos) or es_encabezado_seccion_servicios(rasgos))):
+                        filas_sin_cups += 1
+                        if filas_sin_cups >= fin_tabla:
+                            # Fuera de la tabla: lo que sigue (encabezados, sedes) se lee con todas las columnas
+                            lector.proyectar_columnas(None)
+                            # Solo se corta si en la ventana siguiente no hay otro encabezado (otra tabla o bloque de sedes)
+                            ventana = CONFIG.FIN_TABLA_VENTANA_ENCABEZADOS
+                            siguiente = next((
+                                k for k, f in enumerate(filas.adelante(ventana), 1)
+                                if f and (es_encabezado_seccion_sedes(f) or es_encabezado_seccion_servicios(f))
+                            ), None)
+                            if siguiente is not None:
+                                # Las filas hasta ese encabezado no cuentan para el corte
+                                filas_sin_cups = -siguiente
+                            else:
+                                self.log.warning(f"Fila {i+1}: fin de tabla ({fin_tabla} filas sin CUPS, "
+                                                 f"sin encabezados en las {ventana} siguientes)")
+                                # Las filas no leídas quedan visibles en el reporte de alertas
+                                self.agregar_alerta(
+                                    TipoAlerta.TABLA_CORTADA,
+                                    f"Hoja '{hoja}' leída hasta la fila {i+1} ({fin_tabla} filas seguidas sin CUPS)",
+                                    nombre
+                                )
+                                declaradas = lector.filas_declaradas(hoja)
+                                self.log.incrementar('cortes_fin_tabla')
+                                if declaradas:
+                                    self.log.incrementar('filas_ahorradas', max(0, min(declaradas, 20000) - filas.leidas))
+                                break
 
                 if not fila or all(c is None for c in fila):
-                    i += 1
                     continue
 
-                if es_encabezado_seccion_sedes(fila):
+                # 🆕 v15.2: Un encabezado leído con proyección puede venir truncado: se quita
+                # la proyección y se relee la fila completa antes de detectar columnas
+                if lector.max_columnas is not None and (
+                    es_encabezado_seccion_sedes(rasgos) or es_encabezado_seccion_servicios(rasgos)
+                ):
+                    lector.proyectar_columnas(None)
+                    fila = lector.fila_completa(hoja, i) or fila
+                    rasgos = RowFeatures(fila)
+
+                if es_encabezado_seccion_sedes(rasgos):
                     self.log.debug(f"Fila {i+1}: Encabezado de SEDES detectado")
                     encontro_sedes = True
                     estado = 'en_sedes'
+                    filas_sin_cups = 0
 
                     idx_hab = -1
                     idx_sede = -1
@@ -3597,84 +5347,64 @@ class ProcesadorAnexo:
 
                     if idx_sede == -1 and idx_hab >= 0:
                         idx_sede = idx_hab + 1
+                    cols_sedes = max(idx_hab, idx_sede) + 1
 
-                    nuevas_sedes = self.extraer_sedes_de_bloque(datos, i + 1, idx_hab, idx_sede)
+                    nuevas_sedes = self.extraer_sedes_de_bloque(
+                        filas.adelante(CONFIG.MAX_LOOKAHEAD_SEDES), idx_hab, idx_sede
+                    )
                     if nuevas_sedes:
                         sedes_activas = nuevas_sedes
                         self.log.debug(f"  Sedes extraídas: {len(sedes_activas)}")
 
-                    i += 1
                     continue
 
-                if es_encabezado_seccion_servicios(fila):
+                if es_encabezado_seccion_servicios(rasgos):
                     self.log.debug(f"Fila {i+1}: Encabezado de SERVICIOS detectado")
                     idx_columnas = self.detectar_columnas(fila)
                     encontro_encabezado_servicios = True
                     estado = 'en_servicios'
+                    filas_sin_cups = 0
 
                     cols_detectadas = [k for k, v in idx_columnas.items() if v >= 0]
                     self.log.debug(f"  Columnas: {cols_detectadas}")
 
-                    i += 1
+                    # 🆕 v15.2: Proyección - no construir celdas de columnas que nunca se consultan
+                    if CONFIG.COLUMNAS_MINIMAS_PROYECCION > 0:
+                        lector.proyectar_columnas(max(
+                            CONFIG.COLUMNAS_MINIMAS_PROYECCION,
+                            max(idx_columnas.values()) + 1,
+                            cols_sedes
+                        ))
+
                     continue
 
                 if estado == 'en_sedes':
-                    if es_dato_de_sede(fila):
-                        i += 1
-                        continue
-                    i += 1
                     continue
 
                 if estado == 'en_servicios' and idx_columnas and sedes_activas:
-                    if es_dato_de_sede(fila):
+                    if es_dato_de_sede(rasgos):
                         self.log.debug(f"Fila {i+1}: Saltando (es dato de sede)")
-                        i += 1
                         continue
 
                     if idx_columnas['cups'] >= 0 and idx_columnas['cups'] < len(fila):
                         cups_raw = fila[idx_columnas['cups']]
                         cups = limpiar_codigo(cups_raw)
 
-                        if cups and validar_cups(cups, fila):
-                            def get_valor(campo: str):
-                                col_idx = idx_columnas.get(campo, -1)
-                                return fila[col_idx] if 0 <= col_idx < len(fila) else None
-
-                            tarifa = get_valor('tarifa')
-                            manual = get_valor('tarifario')
-                            descripcion = get_valor('descripcion')
-
-                            if not validar_tarifa(tarifa):
-                                self.log.debug(f"Fila {i+1}: Tarifa rechazada (parece teléfono)")
-                                i += 1
-                                continue
-
-                            if not validar_manual_tarifario(manual):
-                                self.log.debug(f"Fila {i+1}: Manual rechazado (parece dirección)")
-                                i += 1
-                                continue
-
-                            if not validar_descripcion(descripcion):
-                                self.log.debug(f"Fila {i+1}: Descripción rechazada (es número de sede)")
-                                i += 1
-                                continue
-
-                            base = {
-                                'codigo_cups': cups,
-                                'codigo_homologo_manual': limpiar_codigo(get_valor('homologo')),
-                                'descripcion_del_cups': limpiar_texto(descripcion),
-                                'tarifa_unitaria_en_pesos': limpiar_tarifa(tarifa),
-                                'manual_tarifario': limpiar_texto(manual),
-                                'porcentaje_manual_tarifario': limpiar_texto(get_valor('porcentaje')),
-                                'observaciones': limpiar_texto(get_valor('observaciones'))
-                            }
+                        if cups:
+                            # 🆕 v15.2: validar_cups/tarifa/manual/descripción se aplican por lote
+                            pendientes.append((i, cups, fila, rasgos, idx_columnas, sedes_activas))
+                            if len(pendientes) >= CONFIG.LOTE_VALIDACION:
+                                self._validar_pendientes(pendientes, servicios)
 
-                            for sede in sedes_activas:
-                                s = base.copy()
-                                s['codigo_de_habilitacion'] = formatear_habilitacion(sede['codigo'], sede['sede'])
-                                servicios.append(s)
+            self._validar_pendientes(pendientes, servicios)
+            self.log.debug(f"Filas leídas: {filas.leidas}")
 
-                i += 1
+            if filas.error is not None:
+                # Igual que antes: una hoja que no se puede leer completa se trata como vacía
+                self.log.error("Hoja vacía o no legible")
+                self.agregar_alerta(TipoAlerta.ERROR_LECTURA, "Hoja vacía", nombre)
+                self.log.dedent()
+                return False, [], "Hoja vacía"
 
             if not encontro_encabezado_servicios:
                 self.log.warning("No se encontró encabezado de servicios")
@@ -3698,9 +5428,32 @@ class ProcesadorAnexo:
             self.agregar_alerta(TipoAlerta.ERROR_PROCESAMIENTO, str(e)[:50], nombre)
             self.log.dedent()
             return False, [], str(e)[:50]
+        finally:
+            if lector:
+                lector.cerrar()
 
     def extraer_con_timeout(self, archivo: str, nombre: str, timeout: int = 60) -> Tuple[bool, List[Dict], str]:
-        """Extrae servicios con timeout."""
+        """Extrae servicios con timeout.
+        🆕 v15.2: Con PoolParseo el timeout termina el proceso; sin pool se usa un hilo.
+        """
+        if self.pool is not None:
+            respuesta = self.pool.extraer(
+                archivo, nombre, self._contrato_actual, self._categoria_cuentas_medicas, timeout
+            )
+            if respuesta is None:
+                self.log.warning(f"Timeout ({timeout}s) procesando archivo - proceso terminado")
+                self.agregar_alerta(TipoAlerta.TIMEOUT, f"Archivo tardó más de {timeout}s", nombre)
+                return False, [], f"Timeout ({timeout}s)"
+            # Sin procesos disponibles (reserva agotada) se sigue con el hilo
+            if respuesta is not PoolParseo.AGOTADO:
+                ok, servicios, msg, alertas, stats, lineas, registros = respuesta
+                self.log.reemitir(lineas, registros)
+                for alerta in alertas:
+                    self.agregar_alerta(alerta.tipo, alerta.mensaje, alerta.archivo)
+                for clave, cantidad in stats.items():
+                    self.log.incrementar(clave, cantidad)
+                return ok, servicios, msg
+
         resultado = [False, [], "Timeout"]
         error_msg = [None]
 
@@ -3727,6 +5480,162 @@ class ProcesadorAnexo:
         return resultado[0], resultado[1], resultado[2]
 
 
+def _worker_parseo(conexion):
+    """🆕 v15.2: Bucle de un proceso de parseo (creado con fork, comparte el código del notebook)."""
+    # El fork pudo ocurrir con el lock del logger tomado por otro hilo
+    LOG._lock = threading.RLock()
+    LOG._local = threading.local()
+    # Las líneas de log vuelven al padre por el pipe (la salida del hijo no llega al notebook)
+    LOG.capturadas = []
+    proc = ProcesadorAnexo(LOG)
+
+    while True:
+        try:
+            tarea = conexion.recv()
+        except (EOFError, OSError):
+            break
+        if tarea is None:
+            break
+
+        archivo, nombre, contrato, categoria = tarea
+        proc.limpiar_alertas()
+        proc.set_contrato(contrato)
+        proc.set_categoria_cuentas_medicas(categoria)
+        stats_antes = dict(LOG.stats)
+        LOG.capturadas.clear()
+        n_registros = len(LOG.logs)
+
+        try:
+            ok, servicios, msg = proc.extraer_servicios(archivo, nombre)
+        except Exception as e:
+            ok, servicios, msg = False, [], str(e)[:50]
+            proc.agregar_alerta(TipoAlerta.ERROR_PROCESAMIENTO, str(e)[:50], nombre)
+
+        # Solo se devuelven estadísticas propias del parseo; las alertas se cuentan en el padre
+        stats = {
+            k: v - stats_antes.get(k, 0) for k, v in LOG.stats.items()
+            if k != 'alertas_generadas' and isinstance(v, (int, float)) and v != stats_antes.get(k, 0)
+        }
+        conexion.send((ok, servicios, msg, proc.alertas, stats, list(LOG.capturadas), LOG.logs[n_registros:]))
+        del LOG.logs[n_registros:]
+
+
+class PoolParseo:
+    """🆕 v15.2: Pool de procesos persistentes para extraer_servicios.
+    Cada llamada toma un proceso libre; si se vence el timeout el proceso se
+    termina (no queda un hilo zombi compitiendo por el GIL) y se reemplaza.
+    Todos los procesos, incluida la reserva de reemplazos, se crean con fork
+    al construir el pool, antes de abrir conexiones: nunca se hace fork desde
+    un proceso con hilos de descarga activos. (spawn/forkserver no sirven: el
+    hijo no puede importar el código definido en el notebook.)
+    """
+
+    # Respuesta de extraer() cuando no queda ningún proceso (el llamador usa un hilo)
+    AGOTADO = object()
+
+    @staticmethod
+    def hilos_de_trabajo() -> List[str]:
+        """Hilos propios del consolidador vivos (transportes SSH, loop asyncio, ejecutores).
+        Con alguno de ellos activo no se hace fork: el hijo heredaría sus locks tomados.
+        """
+        return [
+            t.name for t in threading.enumerate()
+            if t is not threading.main_thread() and (
+                isinstance(t, paramiko.Transport) or t.name == 'sftp-asyncio'
+                or t.name.startswith('ThreadPoolExecutor')
+            )
+        ]
+
+    def __init__(self, n_procesos: int, logger: Logger, repuestos: int = 0):
+        self.log = logger
+        self._ctx = multiprocessing.get_context('fork')
+        self._libres = queue.Queue()
+        self._repuestos = queue.Queue()
+        self._lock = threading.Lock()
+        self.timeouts = 0
+        self.reemplazos = 0
+        self.n_procesos = max(1, n_procesos)
+        self.activos = self.n_procesos
+        for _ in range(self.n_procesos):
+            self._libres.put(self._iniciar_proceso())
+        for _ in range(max(0, repuestos)):
+            self._repuestos.put(self._iniciar_proceso())
+
+    def _iniciar_proceso(self):
+        padre, hijo = self._ctx.Pipe()
+        proceso = self._ctx.Process(target=_worker_parseo, args=(hijo,), daemon=True)
+        proceso.start()
+        hijo.close()
+        return proceso, padre
+
+    def _reemplazar(self, proceso, conexion):
+        try:
+            proceso.terminate()
+            proceso.join(5)
+            conexion.close()
+        except Exception:
+            pass
+        try:
+            repuesto = self._repuestos.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                self.activos -= 1
+                activos = self.activos
+            self.log.warning(f"Reserva de procesos de parseo agotada ({activos} activos)")
+            return
+        with self._lock:
+            self.reemplazos += 1
+        self._libres.put(repuesto)
+
+    def _tomar(self):
+        """Espera un proceso libre; None si ya no queda ninguno activo."""
+        while self.activos > 0:
+            try:
+                return self._libres.get(timeout=1)
+            except queue.Empty:
+                continue
+        return None
+
+    def extraer(self, archivo: str, nombre: str, contrato: str, categoria: str, timeout: int):
+        """Retorna (ok, servicios, msg, alertas, stats, lineas, registros), None si se
+        venció el timeout, o AGOTADO si no queda ningún proceso."""
+        libre = self._tomar()
+        if libre is None:
+            return PoolParseo.AGOTADO
+        proceso, conexion = libre
+        try:
+            conexion.send((archivo, nombre, contrato, categoria))
+            if conexion.poll(timeout):
+                respuesta = conexion.recv()
+                self._libres.put((proceso, conexion))
+                return respuesta
+        except (EOFError, OSError) as e:
+            self.log.warning("Proceso de parseo caído, se reemplaza", str(e)[:30])
+            self._reemplazar(proceso, conexion)
+            return False, [], "Proceso de parseo terminó inesperadamente", [], {}, [], []
+
+        with self._lock:
+            self.timeouts += 1
+        self._reemplazar(proceso, conexion)
+        return None
+
+    def cerrar(self):
+        for cola in (self._libres, self._repuestos):
+            while not cola.empty():
+                proceso, conexion = cola.get_nowait()
+                try:
+                    conexion.send(None)
+                    proceso.join(2)
+                except Exception:
+                    pass
+                if proceso.is_alive():
+                    proceso.terminate()
+
+    def resumen(self) -> str:
+        return (f"{self.n_procesos} procesos ({self.activos} activos), "
+                f"{self.timeouts} timeouts, {self.reemplazos} reemplazos")
+
+
 LOG.success("Procesador de anexos v14.1 configurado")
 LOG.success("🆕 Detección de columnas con prioridad estricta")
 LOG.dedent()
@@ -3738,25 +5647,8 @@ LOG.dedent()
 def obtener_fecha_acuerdo(numero: str, ano: str, origen: str, fecha_archivo: float = None) -> Tuple[Optional[str], bool]:
     """Obtiene fecha de acuerdo de forma inteligente."""
     try:
-        fila = None
-
-        if COLS.cto:
-            cto_str = f"{str(numero).zfill(4)}-{ano}"
-            mask = df_prestadores[COLS.cto] == cto_str
-            if mask.any():
-                fila = df_prestadores[mask].iloc[0]
-
-        if fila is None and COLS.numero_contrato and COLS.ano_contrato:
-            try:
-                mask = (
-                    df_prestadores[COLS.numero_contrato].astype(str).str.replace('.0', '', regex=False).str.zfill(4) == str(numero).zfill(4)
-                ) & (
-                    df_prestadores[COLS.ano_contrato].astype(str).str.replace('.0', '', regex=False) == str(ano)
-                )
-                if mask.any():
-                    fila = df_prestadores[mask].iloc[0]
-            except:
-                pass
+        # 🆕 v15.2: Búsqueda O(1) en el índice de prestadores
+        fila = INDICE_PRESTADORES.fila(numero, ano)
 
         fecha = None
         columnas = list(df_prestadores.columns) if fila is not None else []
@@ -3982,17 +5874,124 @@ LOG.dedent()
 # CELDA 11: CONEXIÓN AL SERVIDOR
 # ══════════════════════════════════════════════════════════════════════════════
 
+@dataclass
+class SesionTrabajo:
+    """🆕 v15.2: Sesión independiente del pool (cliente SFTP + buscador + procesador)."""
+    id: int
+    cliente: SFTPClient
+    buscador: BuscadorAnexos
+    procesador: ProcesadorAnexo
+    contratos_atendidos: int = 0
+
+
+# 🆕 v15.2: Cache de listados compartida por todas las sesiones
+CACHE_LISTADOS = CacheListados(CONFIG.CACHE_LISTADOS_TTL, CONFIG.CACHE_LISTADOS_MAX)
+# 🆕 v15.2: Cache persistente de descargas (sobrevive entre ejecuciones)
+CACHE_DESCARGAS = CacheDescargas(CONFIG.CARPETA_CACHE_DESCARGAS, CONFIG.CACHE_DESCARGAS_MAX_MB)
+# 🆕 v15.2: Recursos de una ejecución anterior en este kernel (p. ej. interrumpida):
+# se cierran antes de crear el pool de parseo, para no hacer fork con sus hilos vivos
+for sesion in globals().get('SESIONES', []):
+    try:
+        sesion.cliente.desconectar()
+    except Exception:
+        pass
+for recurso in ('POOL_PARSEO', 'CONEXIONES_ASYNC'):
+    if globals().get(recurso):
+        try:
+            globals()[recurso].cerrar()
+        except Exception:
+            pass
+# 🆕 v15.2: Pool de parseo compartido; todos sus procesos (y la reserva) se crean
+# aquí, antes de abrir conexiones y de lanzar cualquier hilo de trabajo
+POOL_PARSEO = None
+if CONTRATOS_A_PROCESAR and CONFIG.PARSEO_EN_PROCESOS:
+    hilos_vivos = PoolParseo.hilos_de_trabajo()
+    if hilos_vivos:
+        LOG.warning("Parseo en procesos deshabilitado: hay hilos activos (fork inseguro)",
+                    ", ".join(hilos_vivos)[:60])
+    else:
+        if CONFIG.PREFETCH_CONTRATOS <= 0 and CONFIG.MAX_SESIONES_SFTP <= 1:
+            LOG.warning("PARSEO_EN_PROCESOS sin pipeline ni sesiones paralelas",
+                        "se parsea un archivo a la vez; solo aporta el timeout real (PREFETCH_CONTRATOS > 0)")
+        POOL_PARSEO = PoolParseo(CONFIG.MAX_PROCESOS_PARSEO, LOG, CONFIG.REPUESTOS_PARSEO)
+        LOG.info(f"Procesos de parseo: {POOL_PARSEO.n_procesos} (+{CONFIG.REPUESTOS_PARSEO} de reserva)")
+# 🆕 v15.2: Conexiones asyncssh compartidas por todas las sesiones (solo con CLIENTE_SFTP='asyncio')
+CONEXIONES_ASYNC = None
+if CONTRATOS_A_PROCESAR and CONFIG.CLIENTE_SFTP == 'asyncio':
+    CONEXIONES_ASYNC = ConexionesAsyncSSH(CONFIG, LOG, CONFIG.CONEXIONES_ASYNC)
+# 🆕 v15.2: Índice SQLite del árbol remoto compartido por todas las sesiones
+INDICE_REMOTO = None
+if CONTRATOS_A_PROCESAR and CONFIG.INDICE_REMOTO_MAX_HORAS > 0:
+    INDICE_REMOTO = IndiceRemoto(CONFIG.ARCHIVO_INDICE_REMOTO, CONFIG.INDICE_REMOTO_MAX_HORAS)
+
+
+def crear_sesion(id_sesion: int) -> SesionTrabajo:
+    cli = crear_cliente_sftp(
+        CONFIG, LOG, cache_listados=CACHE_LISTADOS, cache_descargas=CACHE_DESCARGAS,
+        conexiones=CONEXIONES_ASYNC, indice_remoto=INDICE_REMOTO
+    )
+    return SesionTrabajo(
+        id=id_sesion,
+        cliente=cli,
+        buscador=BuscadorAnexos(cli, CONFIG, LOG),
+        procesador=ProcesadorAnexo(LOG, pool=POOL_PARSEO)
+    )
+
+
+SESIONES: List[SesionTrabajo] = []
+
 if CONTRATOS_A_PROCESAR:
     LOG.header("CONEXIÓN AL SERVIDOR SFTP")
 
-    cliente = SFTPClient(CONFIG, LOG)
+    sesion_principal = crear_sesion(0)
+    SESIONES.append(sesion_principal)
+    cliente = sesion_principal.cliente
+    buscador = sesion_principal.buscador
+    procesador = sesion_principal.procesador
 
     if cliente.conectar():
-        buscador = BuscadorAnexos(cliente, CONFIG, LOG)
-        procesador = ProcesadorAnexo(LOG)
+        # 🆕 v15.2: Sesiones adicionales hasta CONFIG.MAX_SESIONES_SFTP
+        n_sesiones = max(1, min(CONFIG.MAX_SESIONES_SFTP, len(CONTRATOS_A_PROCESAR)))
+        for i in range(1, n_sesiones):
+            sesion = crear_sesion(i)
+            if not sesion.cliente.conectar(silencioso=True):
+                LOG.warning(f"No se pudo abrir la sesión {i + 1}", f"se continúa con {len(SESIONES)}")
+                break
+            SESIONES.append(sesion)
 
         LOG.info(f"Contratos a procesar: {len(CONTRATOS_A_PROCESAR)}")
         LOG.info(f"Timeout por archivo: {CONFIG.TIMEOUT_ARCHIVO}s")
+        LOG.info(f"Sesiones SFTP activas: {len(SESIONES)}")
+
+        # 🆕 v15.2: Barrido paralelo de los años a procesar hacia el índice remoto
+        if INDICE_REMOTO and len(CONTRATOS_A_PROCESAR) >= CONFIG.INDICE_REMOTO_MIN_CONTRATOS:
+            def expandir_indice(nombre: str, profundidad: int) -> bool:
+                if profundidad > CONFIG.INDICE_REMOTO_PROFUNDIDAD:
+                    return False
+                if profundidad == 2:
+                    return 'tarifa' in nombre.lower()
+                if profundidad == 3:
+                    return 'acta' in nombre.lower()
+                return True
+
+            try:
+                carpetas = [i['nombre'] for i in cliente.listar('/') if i['es_directorio']]
+                cp = buscador.buscar_carpeta(carpetas, CONFIG.CARPETA_PRINCIPAL)
+                raices = []
+                if cp:
+                    ruta_principal = posixpath.join('/', cp)
+                    carpetas = [i['nombre'] for i in cliente.listar(ruta_principal) if i['es_directorio']]
+                    for ano in sorted({c['ano'] for c in CONTRATOS_A_PROCESAR}):
+                        ca = buscador.buscar_carpeta(carpetas, f'contratos {ano}')
+                        if ca:
+                            raices.append(posixpath.join(ruta_principal, ca))
+                # Se barre en cada ejecución: el índice no sirve listados de ejecuciones anteriores
+                if raices:
+                    t_barrido = time.time()
+                    n_carpetas = INDICE_REMOTO.barrer([s.cliente for s in SESIONES], raices, expandir_indice)
+                    LOG.success(f"🆕 Índice remoto: {n_carpetas} carpetas en {time.time() - t_barrido:.1f}s")
+            except Exception as e:
+                LOG.warning("No se pudo construir el índice remoto", str(e)[:40])
     else:
         LOG.error("No se pudo conectar. Verifica la red y credenciales.")
 else:
@@ -4002,6 +6001,8 @@ else:
 # CELDA 12: PROCESAMIENTO PRINCIPAL v14.1 - CON RECONEXIÓN FORZADA
 # ══════════════════════════════════════════════════════════════════════════════
 
+CHECKPOINT = None
+
 if not CONTRATOS_A_PROCESAR:
     LOG.warning("No hay contratos para procesar")
 else:
@@ -4040,25 +6041,11 @@ else:
 
     def detectar_ambulancia_en_maestra(numero: str, ano: str) -> Tuple[bool, str, str]:
         try:
-            cto_str = f"{str(numero).zfill(4)}-{ano}"
-
-            mask = None
-            if COLS.cto:
-                mask = df_maestra[COLS.cto] == cto_str
-
-            if mask is None or not mask.any():
-                if COLS.numero_contrato and COLS.ano_contrato:
-                    mask = (
-                        df_maestra[COLS.numero_contrato].astype(str).str.replace('.0', '', regex=False).str.zfill(4) == str(numero).zfill(4)
-                    ) & (
-                        df_maestra[COLS.ano_contrato].astype(str).str.replace('.0', '', regex=False) == str(ano)
-                    )
-
-            if mask is None or not mask.any():
+            # 🆕 v15.2: Búsqueda O(1) en el índice de la maestra
+            fila_cto = INDICE_MAESTRA.fila(numero, ano)
+            if fila_cto is None:
                 return False, "", ""
 
-            fila_cto = df_maestra[mask].iloc[0]
-
             for col in df_maestra.columns:
                 col_upper = str(col).upper().strip()
 
@@ -4088,25 +6075,11 @@ else:
 
     def obtener_categoria_cuentas_medicas(numero: str, ano: str) -> str:
         try:
-            cto_str = f"{str(numero).zfill(4)}-{ano}"
-
-            mask = None
-            if COLS.cto:
-                mask = df_maestra[COLS.cto] == cto_str
-
-            if mask is None or not mask.any():
-                if COLS.numero_contrato and COLS.ano_contrato:
-                    mask = (
-                        df_maestra[COLS.numero_contrato].astype(str).str.replace('.0', '', regex=False).str.zfill(4) == str(numero).zfill(4)
-                    ) & (
-                        df_maestra[COLS.ano_contrato].astype(str).str.replace('.0', '', regex=False) == str(ano)
-                    )
-
-            if mask is None or not mask.any():
+            # 🆕 v15.2: Búsqueda O(1) en el índice de la maestra
+            fila_cto = INDICE_MAESTRA.fila(numero, ano)
+            if fila_cto is None:
                 return ""
 
-            fila_cto = df_maestra[mask].iloc[0]
-
             for col in df_maestra.columns:
                 col_upper = str(col).upper().strip()
                 if 'CATEGOR' in col_upper and 'CUENTA' in col_upper:
@@ -4124,139 +6097,186 @@ else:
             alertas_set.add(clave)
             todas_alertas.append(alerta_dict)
 
-    # 🆕 v14.1: RECONECTAR CADA N CONTRATOS
-    RECONECTAR_CADA_N = 10
+    # 🆕 v15.2: MODO INCREMENTAL - manifiesto de la ejecución anterior
+    MANIFIESTO = ManifiestoEjecucion(CONFIG.ARCHIVO_MANIFIESTO, CONFIG) if CONFIG.MODO_INCREMENTAL else None
+    if MANIFIESTO:
+        LOG.info(f"🆕 Modo incremental: manifiesto {CONFIG.ARCHIVO_MANIFIESTO}")
+        if MANIFIESTO.descartado:
+            LOG.warning("Manifiesto anterior descartado", MANIFIESTO.descartado)
 
-    for idx, contrato in enumerate(CONTRATOS_A_PROCESAR, 1):
+    # 🆕 v15.2: Reciclaje de conexiones por salud (antes: reconectar cada 10 contratos)
+    GESTOR_CONEXIONES = GestorConexiones(CONFIG, LOG)
+
+    def asegurar_conexion(sesion: SesionTrabajo) -> bool:
+        """🆕 v15.2: Reutiliza la conexión de la sesión salvo que el gestor indique reciclarla."""
+        sesion.contratos_atendidos += 1
+        return GESTOR_CONEXIONES.asegurar(sesion.cliente, f"sesión {sesion.id}")
+
+    def descargar_contrato(idx: int, total: int, contrato: Dict, sesion: SesionTrabajo) -> ContratoDescargado:
+        """🆕 v15.2: Etapa de red - navega y descarga los anexos de un contrato con la sesión indicada."""
         numero, ano = contrato['numero'], contrato['ano']
         id_c = f"{numero}-{ano}"
+        r = ResultadoContrato(idx=idx, contrato=id_c)
+        d = ContratoDescargado(resultado=r, numero=numero, ano=ano)
+        cli, bus = sesion.cliente, sesion.buscador
 
-        LOG.contract_start(idx, len(CONTRATOS_A_PROCESAR), id_c)
+        LOG.contract_start(idx, total, id_c)
 
         es_ambulancia, col_ambulancia, valor_ambulancia = detectar_ambulancia_en_maestra(numero, ano)
-        categoria_cuentas_medicas = obtener_categoria_cuentas_medicas(numero, ano)
+        d.es_ambulancia = es_ambulancia
+        d.categoria_cuentas_medicas = obtener_categoria_cuentas_medicas(numero, ano)
 
         if es_ambulancia:
             LOG.info(f"📋 Contrato identificado como AMBULANCIAS desde maestra")
             LOG.info(f"   Columna: '{col_ambulancia}' → '{valor_ambulancia[:50]}...'")
 
-            agregar_alerta_unica(Alerta(
+            r.alertas.append(Alerta(
                 tipo=TipoAlerta.CONTRATO_AMBULANCIA_MAESTRA,
                 mensaje=f"Identificado como contrato de ambulancias - Columna '{col_ambulancia}' contiene '{valor_ambulancia[:30]}'",
                 contrato=id_c
             ).to_dict())
 
-        t_c = time.time()
+        t_c = d.t_inicio = time.time()
 
-        # 🆕 v14.1: RECONEXIÓN FORZADA
+        # 🆕 v15.2: Conexión reciclada solo si el gestor lo indica
         LOG.indent()
-        LOG.info("🔄 Verificando/renovando conexión SFTP...")
-
-        conexion_ok = False
-
-        if idx % RECONECTAR_CADA_N == 1 or not cliente.esta_activo():
-            LOG.debug(f"Reconexión forzada (contrato #{idx})")
-            if cliente.reconectar_forzado(silencioso=True):
-                conexion_ok = True
-                LOG.success("Conexión renovada")
-            else:
-                for intento in range(3):
-                    if cliente.conectar(True):
-                        conexion_ok = True
-                        break
-                    LOG.warning(f"Reintento de conexión {intento + 1}/3...")
-                    time.sleep(2)
-        else:
-            if cliente.esta_activo():
-                conexion_ok = True
-            else:
-                for intento in range(3):
-                    LOG.warning(f"Reconectando (intento {intento + 1})...")
-                    if cliente.conectar(True):
-                        conexion_ok = True
-                        break
-                    time.sleep(2)
+        LOG.debug("🔄 Verificando conexión SFTP...")
 
-        if not conexion_ok:
+        if not asegurar_conexion(sesion):
             LOG.error("Sin conexión al servidor")
-            resumen_contratos.append({
+            r.reintentar = True
+            r.resumen = {
                 'contrato': id_c, 'exito': 'NO', 'registros': 0,
                 'mensaje': 'Sin conexión (Socket closed)', 'tiempo': 0
-            })
-            agregar_alerta_unica(Alerta(
+            }
+            r.alertas.append(Alerta(
                 tipo=TipoAlerta.CONEXION,
                 mensaje='No se pudo conectar - Socket is closed',
                 contrato=id_c
             ).to_dict())
             LOG.dedent()
             LOG.contract_end(False, 0, time.time() - t_c, "Sin conexión")
-            continue
+            return d
 
-        carpeta = os.path.join(CARPETA_TRABAJO, f"t_{numero}_{ano}")
+        carpeta = d.carpeta = os.path.join(CARPETA_TRABAJO, f"t_{numero}_{ano}")
         os.makedirs(carpeta, exist_ok=True)
 
-        buscador.limpiar_alertas()
-        buscador.set_contrato(id_c)
-        procesador.limpiar_alertas()
-        procesador.set_contrato(id_c)
-        procesador.set_categoria_cuentas_medicas(categoria_cuentas_medicas)
+        bus.limpiar_alertas()
+        bus.set_contrato(id_c)
 
         res = {'exito': False, 'archivos': [], 'mensaje': 'Error'}
 
+        # 🆕 v15.2: Archivos sin cambios desde la última ejecución no se descargan
+        previos = d.previos = MANIFIESTO.archivos_previos(id_c, d.categoria_cuentas_medicas) if MANIFIESTO else {}
+        bus.set_reutilizables(previos.keys())
+
         for intento in range(3):
             try:
-                ok, msg, ruta = buscador.navegar_a_contrato(ano, numero)
+                ok, msg, ruta = bus.navegar_a_contrato(ano, numero)
                 if ok:
-                    res = buscador.descargar_anexos(carpeta, id_c)
+                    res = bus.descargar_anexos(carpeta, id_c, ruta)
                 else:
                     res = {'exito': False, 'archivos': [], 'mensaje': msg}
                 break
             except Exception as e:
                 if 'socket' in str(e).lower() and intento < 2:
                     LOG.warning("Error de socket, reconectando...")
-                    cliente.reconectar_forzado(silencioso=True)
+                    cli.reconectar_forzado(silencioso=True)
                 else:
                     res['mensaje'] = str(e)[:30]
+                    r.reintentar = True
                     break
 
-        for alerta in buscador.alertas:
-            agregar_alerta_unica(alerta.to_dict())
+        for alerta in bus.alertas:
+            r.alertas.append(alerta.to_dict())
 
         if not res['exito']:
-            resumen_contratos.append({
+            r.resumen = {
                 'contrato': id_c, 'exito': 'NO', 'registros': 0,
                 'mensaje': res['mensaje'], 'tiempo': round(time.time() - t_c, 1)
-            })
+            }
 
             try: shutil.rmtree(carpeta)
             except: pass
 
             LOG.dedent()
             LOG.contract_end(False, 0, time.time() - t_c, res['mensaje'])
-            continue
+            return d
+
+        # Un archivo marcado como reutilizable sin entrada en el manifiesto se descarga aquí
+        for arch in res['archivos']:
+            if arch.reutilizado and ManifiestoEjecucion.clave_archivo(
+                    arch.ruta_remota, arch.tamano, arch.fecha_modificacion) not in previos:
+                cli.descargar(arch.ruta_remota, arch.ruta_local, tamano=arch.tamano,
+                              fecha_modificacion=arch.fecha_modificacion)
+                arch.reutilizado = False
+
+        d.archivos = res['archivos']
+        d.listo = True
+        LOG.dedent()
+        return d
+
+    def parsear_contrato(d: ContratoDescargado, proc: ProcesadorAnexo) -> ResultadoContrato:
+        """🆕 v15.2: Etapa de CPU - extrae los servicios de los anexos ya descargados.
+        No toca el estado global: todo queda en el ResultadoContrato.
+        """
+        r = d.resultado
+        if not d.listo:
+            return r
+
+        numero, ano, id_c = d.numero, d.ano, r.contrato
+        t_c, carpeta, previos, es_ambulancia = d.t_inicio, d.carpeta, d.previos, d.es_ambulancia
+
+        LOG.indent()
+        proc.limpiar_alertas()
+        proc.set_contrato(id_c)
+        proc.set_categoria_cuentas_medicas(d.categoria_cuentas_medicas)
 
         regs = 0
         es_prob = id_c in CONFIG.CONTRATOS_PROBLEMATICOS
         timeout = CONFIG.TIMEOUT_CONTRATOS_PROBLEMATICOS if es_prob else CONFIG.TIMEOUT_ARCHIVO
+        alertas_proc = []
+        entradas_manifiesto = []
+        reutilizados = 0
 
-        for arch in res['archivos']:
+        for arch in d.archivos:
             nombre = arch.nombre if hasattr(arch, 'nombre') else arch.get('nombre', '')
             ruta = arch.ruta_local if hasattr(arch, 'ruta_local') else arch.get('ruta_local', '')
             origen = arch.origen_completo if hasattr(arch, 'origen_completo') else arch.get('origen', '')
             fecha_mod = arch.fecha_modificacion if hasattr(arch, 'fecha_modificacion') else arch.get('fecha_modificacion')
+            clave = ManifiestoEjecucion.clave_archivo(arch.ruta_remota, arch.tamano, fecha_mod)
 
             try:
-                ok, servs, msg = procesador.extraer_con_timeout(ruta, nombre, timeout)
+                previo = previos.get(clave) if arch.reutilizado else None
+                if previo:
+                    # 🆕 v15.2: Mismo archivo que la ejecución anterior → reutilizar extracción
+                    ok, servs, msg = previo['ok'], [dict(s) for s in previo['servicios']], previo['mensaje']
+                    alertas_proc.extend(previo['alertas'])
+                    reutilizados += 1
+                else:
+                    n_alertas = len(proc.alertas)
+                    ok, servs, msg = proc.extraer_con_timeout(ruta, nombre, timeout)
+                    alertas_archivo = [a.to_dict() for a in proc.alertas[n_alertas:]]
+                    alertas_proc.extend(alertas_archivo)
+                    if clave and not msg.startswith('Timeout'):
+                        previo = {
+                            'clave': clave, 'nombre': nombre, 'ruta_remota': arch.ruta_remota,
+                            'tamano': arch.tamano, 'fecha_modificacion': fecha_mod,
+                            'ok': ok, 'mensaje': msg,
+                            'servicios': [dict(s) for s in servs], 'alertas': alertas_archivo
+                        }
+                if previo:
+                    entradas_manifiesto.append(previo)
 
                 if ok and servs:
                     fecha, f_ok = obtener_fecha_acuerdo(numero, ano, origen, fecha_mod)
 
                     if f_ok:
-                        fechas_ok += 1
+                        r.fechas_ok += 1
                     else:
-                        fechas_no += 1
-                        contratos_sin_fecha.add(id_c)
-                        agregar_alerta_unica(Alerta(
+                        r.fechas_no += 1
+                        r.sin_fecha = True
+                        r.alertas.append(Alerta(
                             tipo=TipoAlerta.FECHA_NO_ENCONTRADA,
                             mensaje=f"Sin fecha para {origen}",
                             contrato=id_c,
@@ -4267,41 +6287,227 @@ else:
                         s['contrato'] = id_c
                         s['origen_tarifa'] = origen
                         s['fecha_de_acuerdo'] = fecha if fecha else ''
-                        consolidado_total.append(s)
+                        r.servicios.append(s)
 
                     regs += len(servs)
                 else:
-                    archivos_no_positiva.append({
+                    r.no_positiva.append({
                         'contrato': id_c,
                         'archivo': nombre,
                         'motivo': msg
                     })
 
             except Exception as e:
-                archivos_no_positiva.append({
+                r.no_positiva.append({
                     'contrato': id_c,
                     'archivo': nombre,
                     'motivo': str(e)[:50]
                 })
 
-        for alerta in procesador.alertas:
-            agregar_alerta_unica(alerta.to_dict())
+        r.alertas.extend(alertas_proc)
+
+        if MANIFIESTO:
+            MANIFIESTO.registrar_contrato(id_c, entradas_manifiesto, reutilizados, d.categoria_cuentas_medicas)
 
         exito = regs > 0
-        resumen_contratos.append({
+        r.resumen = {
             'contrato': id_c,
             'exito': 'SI' if exito else 'NO',
             'registros': regs,
             'mensaje': f'{regs} servicios' if exito else 'Sin servicios',
             'tiempo': round(time.time() - t_c, 1),
             'es_ambulancia': 'SI' if es_ambulancia else 'NO'
-        })
+        }
 
         try: shutil.rmtree(carpeta)
         except: pass
 
         LOG.dedent()
         LOG.contract_end(exito, regs, time.time() - t_c, '' if exito else 'Sin servicios')
+        return r
+
+    def procesar_contrato(idx: int, total: int, contrato: Dict, sesion: SesionTrabajo) -> ResultadoContrato:
+        """🆕 v15.2: Navega, descarga y extrae un contrato con la sesión indicada (sin pipeline)."""
+        return parsear_contrato(descargar_contrato(idx, total, contrato, sesion), sesion.procesador)
+
+    def resultado_con_error(idx: int, id_c: str, etapa: str, e: Exception) -> ResultadoContrato:
+        """🆕 v15.2: Resultado de un contrato cuya etapa lanzó una excepción; el pipeline sigue con el resto."""
+        mensaje = f"Error en {etapa}: {str(e)[:50]}"
+        LOG.reset_indent()
+        LOG.error(f"Contrato {id_c}", mensaje)
+        r = ResultadoContrato(idx=idx, contrato=id_c, reintentar=True)
+        r.resumen = {
+            'contrato': id_c, 'exito': 'NO', 'registros': 0,
+            'mensaje': mensaje, 'tiempo': 0
+        }
+        r.alertas.append(Alerta(
+            tipo=TipoAlerta.ERROR_PROCESAMIENTO,
+            mensaje=mensaje,
+            contrato=id_c
+        ).to_dict())
+        return r
+
+    def ejecutar_pipeline(pendientes: List[Tuple[int, Dict]]) -> Dict[int, ResultadoContrato]:
+        """🆕 v15.2: Descarga y parseo solapados.
+        Las sesiones SFTP descargan contratos mientras los parseadores extraen los ya
+        descargados; la cola acotada limita cuántos contratos esperan en disco.
+        """
+        cola_contratos = queue.Queue()
+        for item in pendientes:
+            cola_contratos.put(item)
+        cola_parseo = queue.Queue(maxsize=CONFIG.PREFETCH_CONTRATOS)
+        resultados: Dict[int, ResultadoContrato] = {}
+
+        # Un error en un contrato se convierte en su ResultadoContrato: ninguna
+        # etapa se detiene y todos los contratos pendientes quedan con resultado
+        def etapa_descarga(sesion: SesionTrabajo):
+            while True:
+                try:
+                    idx, contrato = cola_contratos.get_nowait()
+                except queue.Empty:
+                    return
+                numero, ano = contrato['numero'], contrato['ano']
+                try:
+                    descargado = descargar_contrato(idx, total_contratos, contrato, sesion)
+                except Exception as e:
+                    shutil.rmtree(os.path.join(CARPETA_TRABAJO, f"t_{numero}_{ano}"), ignore_errors=True)
+                    descargado = ContratoDescargado(
+                        resultado=resultado_con_error(idx, f"{numero}-{ano}", 'descarga', e),
+                        numero=numero, ano=ano
+                    )
+                cola_parseo.put(descargado)
+
+        def etapa_parseo(proc: ProcesadorAnexo):
+            while True:
+                descargado = cola_parseo.get()
+                if descargado is None:
+                    return
+                r = descargado.resultado
+                try:
+                    resultados[r.idx] = procesar_y_registrar_parseo(descargado, proc)
+                except Exception as e:
+                    if descargado.carpeta:
+                        shutil.rmtree(descargado.carpeta, ignore_errors=True)
+                    resultados[r.idx] = resultado_con_error(r.idx, r.contrato, 'parseo', e)
+
+        n_parseadores = POOL_PARSEO.n_procesos if POOL_PARSEO else 1
+        parseadores = [
+            threading.Thread(target=etapa_parseo, args=(ProcesadorAnexo(LOG, pool=POOL_PARSEO),), daemon=True)
+            for _ in range(n_parseadores)
+        ]
+        for hilo in parseadores:
+            hilo.start()
+
+        try:
+            with ThreadPoolExecutor(max_workers=len(SESIONES)) as ejecutor:
+                list(ejecutor.map(etapa_descarga, SESIONES))
+        finally:
+            for _ in parseadores:
+                cola_parseo.put(None)
+            for hilo in parseadores:
+                hilo.join()
+
+        return resultados
+
+    def fusionar_resultado(r: ResultadoContrato):
+        """🆕 v15.2: Integra un ResultadoContrato en los acumuladores globales."""
+        global fechas_ok, fechas_no
+
+        consolidado_total.extend(r.servicios)
+        for alerta in r.alertas:
+            agregar_alerta_unica(alerta)
+        if r.resumen:
+            resumen_contratos.append(r.resumen)
+        archivos_no_positiva.extend(r.no_positiva)
+        fechas_ok += r.fechas_ok
+        fechas_no += r.fechas_no
+        if r.sin_fecha:
+            contratos_sin_fecha.add(r.contrato)
+
+    total_contratos = len(CONTRATOS_A_PROCESAR)
+
+    # 🆕 v15.2: CHECKPOINT / REANUDACIÓN
+    CHECKPOINT = CheckpointContratos(
+        os.path.join(CARPETA_TRABAJO, 'checkpoint.jsonl'),
+        [f"{c['numero']}-{c['ano']}" for c in CONTRATOS_A_PROCESAR]
+    )
+    completados = CHECKPOINT.cargar()
+    reanudar = False
+    if completados:
+        reanudar = CONFIG.REANUDAR
+        if reanudar is None:
+            resp = input(f"➤ Hay {len(completados)}/{total_contratos} contratos en checkpoint. ¿Reanudar? (s/n): ")
+            reanudar = resp.strip().lower().startswith('s')
+        if reanudar:
+            LOG.info(f"🆕 Reanudando: {len(completados)} contratos ya procesados")
+        else:
+            completados = {}
+    CHECKPOINT.abrir(reanudar)
+
+    def procesar_y_registrar(idx: int, contrato: Dict, sesion: SesionTrabajo) -> ResultadoContrato:
+        """Un error en el contrato se convierte en su resultado: el resto de la corrida sigue."""
+        try:
+            r = procesar_contrato(idx, total_contratos, contrato, sesion)
+        except Exception as e:
+            shutil.rmtree(os.path.join(CARPETA_TRABAJO, f"t_{contrato['numero']}_{contrato['ano']}"), ignore_errors=True)
+            return resultado_con_error(idx, f"{contrato['numero']}-{contrato['ano']}", 'proceso', e)
+        CHECKPOINT.registrar(r)
+        return r
+
+    def procesar_y_registrar_parseo(d: ContratoDescargado, proc: ProcesadorAnexo) -> ResultadoContrato:
+        r = parsear_contrato(d, proc)
+        CHECKPOINT.registrar(r)
+        return r
+
+    if CONFIG.PREFETCH_CONTRATOS > 0:
+        # 🆕 v15.2: PIPELINE descarga/parseo; se fusiona en el orden original
+        LOG.info(f"🆕 Pipeline: hasta {CONFIG.PREFETCH_CONTRATOS} contratos descargados en espera de parseo")
+        nuevos = ejecutar_pipeline([
+            (idx, contrato) for idx, contrato in enumerate(CONTRATOS_A_PROCESAR, 1)
+            if idx not in completados
+        ])
+        for idx in range(1, total_contratos + 1):
+            fusionar_resultado(completados[idx] if idx in completados else nuevos[idx])
+    elif len(SESIONES) <= 1:
+        for idx, contrato in enumerate(CONTRATOS_A_PROCESAR, 1):
+            if idx in completados:
+                fusionar_resultado(completados[idx])
+                continue
+            fusionar_resultado(procesar_y_registrar(idx, contrato, SESIONES[0]))
+    else:
+        # 🆕 v15.2: POOL DE SESIONES - cada hilo toma una sesión libre y la devuelve al terminar.
+        # Los resultados se fusionan en el orden original de los contratos.
+        LOG.info(f"🆕 Modo pool: {len(SESIONES)} sesiones SFTP en paralelo")
+        sesiones_libres = queue.Queue()
+        for sesion in SESIONES:
+            sesiones_libres.put(sesion)
+
+        def _procesar_en_pool(idx: int, contrato: Dict) -> ResultadoContrato:
+            sesion = sesiones_libres.get()
+            try:
+                return procesar_y_registrar(idx, contrato, sesion)
+            finally:
+                sesiones_libres.put(sesion)
+
+        with ThreadPoolExecutor(max_workers=len(SESIONES)) as ejecutor:
+            futuros = {
+                idx: ejecutor.submit(_procesar_en_pool, idx, contrato)
+                for idx, contrato in enumerate(CONTRATOS_A_PROCESAR, 1)
+                if idx not in completados
+            }
+            for idx in range(1, total_contratos + 1):
+                if idx in completados:
+                    fusionar_resultado(completados[idx])
+                    continue
+                try:
+                    r = futuros[idx].result()
+                except Exception as e:
+                    contrato = CONTRATOS_A_PROCESAR[idx - 1]
+                    r = resultado_con_error(idx, f"{contrato['numero']}-{contrato['ano']}", 'proceso', e)
+                fusionar_resultado(r)
+
+    if MANIFIESTO:
+        MANIFIESTO.guardar()
 
     LOG.stats_summary()
 
@@ -4311,7 +6517,26 @@ else:
     print(f"   • Archivos sin formato POSITIVA: {len(archivos_no_positiva)}")
     print(f"   • Contratos sin fecha en maestra: {len(contratos_sin_fecha)}")
     print(f"   • Fechas encontradas: {fechas_ok} | No encontradas: {fechas_no}")
-    print(f"   • Reconexiones SFTP: {cliente.reconexiones}")
+    print(f"   • Reconexiones SFTP: {sum(s.cliente.reconexiones for s in SESIONES)}")
+    print(f"   • Conexiones: {GESTOR_CONEXIONES.resumen([s.cliente for s in SESIONES])}")
+    ops_sftp = sum(s.cliente.operaciones for s in SESIONES)
+    sondeos = sum(s.cliente.sondeos for s in SESIONES)
+    print(f"   • Operaciones SFTP: {ops_sftp:,} | sondeos de conexión enviados (stat '/'): {sondeos:,}")
+    print(f"   • Cache de listados: {CACHE_LISTADOS.resumen()}")
+    print(f"   • Cache de descargas: {CACHE_DESCARGAS.resumen()}")
+    if INDICE_REMOTO:
+        print(f"   • Índice remoto: {INDICE_REMOTO.aciertos} listados resueltos sin ir al servidor")
+    if POOL_PARSEO:
+        print(f"   • Parseo en procesos: {POOL_PARSEO.resumen()}")
+    print(f"   • Cortes por fin de tabla: {LOG.stats.get('cortes_fin_tabla', 0)} "
+          f"(~{LOG.stats.get('filas_ahorradas', 0):,} filas sin leer)")
+    # 🆕 v15.2: Filas candidatas rechazadas por regla (validación por lotes)
+    rechazos = sorted(((k[len('rechazo_'):], v) for k, v in LOG.stats.items() if k.startswith('rechazo_')),
+                      key=lambda x: -x[1])
+    if rechazos:
+        print("   • Filas rechazadas por regla: " + ", ".join(f"{m} {v:,}" for m, v in rechazos[:5]))
+    if MANIFIESTO:
+        print(f"   • Modo incremental: {MANIFIESTO.resumen()}")
 
     contratos_ambulancia = sum(1 for r in resumen_contratos if r.get('es_ambulancia') == 'SI')
     if contratos_ambulancia > 0:
@@ -4378,7 +6603,8 @@ if todas_alertas:
                 'HOJA_NO_ENCONTRADA',
                 'TARIFA_SERVICIOS_NO_ENCONTRADA',
                 'COLUMNAS_NO_DETECTADAS',
-                'SEDES_NO_DETECTADAS'
+                'SEDES_NO_DETECTADAS',
+                'TABLA_CORTADA'
             ],
             'FECHAS_FALTANTES': [
                 'FECHA_NO_ENCONTRADA',
@@ -4456,9 +6682,24 @@ if archivos_no_positiva:
     LOG.success(f"Generado: {nombre}", f"{len(archivos_no_positiva)} archivos")
     archivos_generados.append(nombre)
 
+# 🆕 v15.2: Calidad de datos - filas candidatas rechazadas por cada regla de validación
+rechazos_por_regla = [
+    {'motivo': m.value, 'filas_rechazadas': LOG.stats.get(f'rechazo_{m.value}', 0)}
+    for m in MotivoRechazo
+]
+if any(r['filas_rechazadas'] for r in rechazos_por_regla):
+    nombre = f"RECHAZOS_{suf}_{ts}.xlsx"
+    pd.DataFrame(rechazos_por_regla).to_excel(nombre, index=False)
+    LOG.success(f"Generado: {nombre}", f"{sum(r['filas_rechazadas'] for r in rechazos_por_regla):,} filas")
+    archivos_generados.append(nombre)
+
 LOG.dedent()
 LOG.info(f"Total archivos generados: {len(archivos_generados)}")
 
+# 🆕 v15.2: Ejecución completa → el checkpoint ya no hace falta
+if CHECKPOINT:
+    CHECKPOINT.finalizar()
+
 
 # ══════════════════════════════════════════════════════════════════════════════
 # SECCIÓN DE TRANSICIÓN: CONSOLIDADOR → ETL
@@ -5286,11 +7527,20 @@ if archivos_generados:
 else:
     LOG.warning("No hay archivos para descargar")
 
-# Cerrar conexión SFTP
-try:
-    cliente.desconectar()
-except:
-    pass
+# Cerrar conexiones SFTP
+for sesion in globals().get('SESIONES', []):
+    try:
+        sesion.cliente.desconectar()
+    except:
+        pass
+
+# 🆕 v15.2: Terminar procesos de parseo y conexiones asyncio compartidas; cerrar índice remoto
+if globals().get('POOL_PARSEO'):
+    POOL_PARSEO.cerrar()
+if globals().get('CONEXIONES_ASYNC'):
+    CONEXIONES_ASYNC.cerrar()
+if globals().get('INDICE_REMOTO'):
+    INDICE_REMOTO.cerrar()
 
 print("\n" + "═"*70)
 print("✅ CONSOLIDADOR T25 + ETL ML - PROCESO COMPLETO FINALIZADO")